@@ -1,49 +1,626 @@
 import os
+import argparse
+import csv
+import hashlib
+import json
+import sqlite3
+import time
+import multiprocessing
 import PyPDF2
 import re
+from fnmatch import fnmatch
+from multiprocessing.connection import wait
 
-def scan_pdfs(directory, keywords):
+try:
+    import resource
+except ImportError:  # not available on Windows; --max-memory is then refused
+    resource = None
+
+class KeywordMatcher:
+    """All keywords compiled into one case-insensitive regex, matched in a single pass.
+
+    The alternation sits inside a lookahead so every position is tried and
+    overlapping keywords are all reported; shorter keywords that are a prefix
+    of the one matched at a position are checked directly. Each keyword has
+    its own group, so a match is mapped back by group number: case-insensitive
+    matching also accepts text such as 'ſ' whose .lower() is not the keyword's.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = [keyword for keyword in dict.fromkeys(keywords) if keyword]
+        self._by_lower = {}
+        for keyword in self.keywords:
+            self._by_lower.setdefault(keyword.lower(), []).append(keyword)
+        self._lowered = sorted(self._by_lower, key=len, reverse=True)
+        self._prefixes = {key: [other for other in self._lowered if other != key and key.startswith(other)]
+                          for key in self._lowered}
+        alternation = '|'.join('(' + re.escape(key) + ')' for key in self._lowered)
+        self._pattern = re.compile(r'(?=\b(?:' + alternation + r')\b)', re.IGNORECASE) if self._lowered else None
+
+    @staticmethod
+    def _is_boundary(text, i):
+        before = i > 0 and (text[i - 1].isalnum() or text[i - 1] == '_')
+        after = i < len(text) and (text[i].isalnum() or text[i] == '_')
+        return before != after
+
+    def positions(self, text):
+        """Return {keyword: [start offsets]} for every keyword occurring in `text`."""
+        hits = {}
+        if self._pattern is None:
+            return hits
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            key = self._lowered[match.lastindex - 1]
+            for other in [key] + self._prefixes[key]:
+                if other is key or self._is_boundary(text, start + len(other)):
+                    for keyword in self._by_lower[other]:
+                        hits.setdefault(keyword, []).append(start)
+        return hits
+
+    def counts(self, text):
+        """Return {keyword: number of hits} for every keyword occurring in `text`."""
+        return {keyword: len(starts) for keyword, starts in self.positions(text).items()}
+
+    def find_keywords(self, text):
+        """Return the keywords occurring in `text`, in the order they were given."""
+        found = self.positions(text)
+        return [keyword for keyword in self.keywords if keyword in found]
+
+def scan_pdf(filepath, matcher, start=0, stop=None, match='report', full_counts=False):
+    """Scan pages [start, stop) of one PDF page by page.
+
+    Each page is searched on its own as soon as it is extracted, the same
+    way the index searches stored pages, so a keyword is never joined to
+    the last word of the previous page. Reading stops once the outcome is settled: at the first hit
+    in 'any' mode, once every keyword is seen otherwise, and never with
+    `full_counts`. Returns ({keyword: hits}, {keyword: [page numbers]},
+    pages read, seconds spent, whether every page was read).
+    """
+    started = time.perf_counter()
+    hits = {}
+    pages = {}
+    pages_read = 0
+    complete = True
+    with open(filepath, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_number, page in enumerate(pdf_reader.pages[start:stop], start + 1):
+            pages_read += 1
+            for keyword, count in matcher.counts(page.extract_text()).items():
+                hits[keyword] = hits.get(keyword, 0) + count
+                pages.setdefault(keyword, []).append(page_number)
+            if not full_counts and hits and (match == 'any' or len(hits) == len(matcher.keywords)):
+                # Stopping on the range's last page still leaves nothing unread
+                last_page = len(pdf_reader.pages) if stop is None else min(stop, len(pdf_reader.pages))
+                complete = page_number == last_page
+                break
+    return hits, pages, pages_read, time.perf_counter() - started, complete
+
+class PageCountError(Exception):
+    """Counting a PDF's pages failed, so it could not be split into page ranges."""
+
+def _scan_task(task):
+    filename, filepath, matcher, start, stop, match, full_counts, count_error = task
+    if count_error:
+        # Report the earlier failure rather than parse the same file again
+        raise PageCountError(count_error)
+    return filename, scan_pdf(filepath, matcher, start, stop, match, full_counts)
+
+def page_count(filepath):
+    with open(filepath, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+def _page_count_task(task):
+    return page_count(task[1])
+
+class PdfFinder:
+    """Discovers PDFs with os.scandir, optionally recursively, applying glob and size filters.
+
+    Patterns containing '/' are matched against the path relative to the
+    scanned directory, others against the file name. Exclude patterns also
+    prune matching directories. Files come out depth-first in sorted order,
+    so discovery is deterministic.
+    """
+
+    def __init__(self, recursive=False, include=(), exclude=(), min_size=None, max_size=None):
+        self.recursive = recursive
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.min_size = min_size
+        self.max_size = max_size
+
+    @staticmethod
+    def _matches(relpath, name, patterns):
+        return any(fnmatch(relpath if '/' in pattern else name, pattern) for pattern in patterns)
+
+    def find(self, directory):
+        """Yield (relative path, path, os.stat_result) for every selected PDF under `directory`."""
+        stack = [('', directory)]
+        while stack:
+            prefix, current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                print(f"Error scanning '{current}': {e}")
+                continue
+            subdirs = []
+            for entry in entries:
+                relpath = prefix + entry.name
+                if self._matches(relpath, entry.name, self.exclude):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((relpath + '/', entry.path))
+                    continue
+                if not entry.name.lower().endswith('.pdf') or not entry.is_file():
+                    continue
+                if self.include and not self._matches(relpath, entry.name, self.include):
+                    continue
+                stat = entry.stat()
+                if self.min_size is not None and stat.st_size < self.min_size:
+                    continue
+                if self.max_size is not None and stat.st_size > self.max_size:
+                    continue
+                yield relpath, entry.path, stat
+            if self.recursive:
+                stack.extend(reversed(subdirs))
+
+def _call(fn, item):
+    # Any exception from a bad file becomes a (None, reason) result instead of ending the run
+    try:
+        return fn(item), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _worker_loop(conn, memory_limit):
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        try:
+            conn.send(_call(*task))
+        except MemoryError:
+            # The result is pickled before anything is written, so the pipe is still clean
+            conn.send((None, "MemoryError: result too large to return"))
+
+class SupervisedPool:
+    """Worker processes that run one task at a time under a time and memory limit.
+
+    A task that raises, runs longer than `timeout` seconds, or takes its
+    worker down (a crash, or exceeding `memory_limit` bytes of address
+    space) is reported as failed and the worker is replaced, so one bad PDF
+    cannot stall or end the run.
+    """
+
+    def __init__(self, workers=1, timeout=None, memory_limit=None):
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+
+    def _spawn(self):
+        conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_worker_loop, args=(child_conn, self.memory_limit), daemon=True)
+        process.start()
+        child_conn.close()
+        return process, conn
+
+    def imap(self, fn, iterable, max_pending=None):
+        """Yield (item, result, error) for each item, in input order.
+
+        Items are submitted lazily with at most `max_pending` in flight or
+        waiting to be yielded, so the input can still be being produced
+        while earlier items run. Exactly one of result and error is None.
+        """
+        max_pending = max_pending or self.workers * 4
+        items = enumerate(iterable)
+        idle = [self._spawn() for _ in range(self.workers)]
+        busy = {}  # conn -> (process, index, item, deadline)
+        done = {}
+        next_index = 0
+        exhausted = False
+        try:
+            while True:
+                while idle and not exhausted and len(busy) + len(done) < max_pending:
+                    try:
+                        index, item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    process, conn = idle.pop()
+                    conn.send((fn, item))
+                    deadline = time.monotonic() + self.timeout if self.timeout else None
+                    busy[conn] = (process, index, item, deadline)
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+                if not busy:
+                    if exhausted:
+                        return
+                    continue
+
+                deadlines = [deadline for _, _, _, deadline in busy.values() if deadline is not None]
+                timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+                wait(list(busy) + [process.sentinel for process, _, _, _ in busy.values()], timeout)
+                for conn, (process, index, item, deadline) in list(busy.items()):
+                    error = None
+                    if conn.poll():
+                        try:
+                            done[index] = (item, *conn.recv())
+                            idle.append((process, conn))
+                            del busy[conn]
+                            continue
+                        except (EOFError, OSError):
+                            error = f"worker exited with code {process.exitcode}"
+                    elif not process.is_alive():
+                        error = f"worker exited with code {process.exitcode}"
+                    elif deadline is not None and time.monotonic() >= deadline:
+                        error = f"timed out after {self.timeout:g}s"
+                    if error:
+                        # The worker may be stuck or half-dead, so it is replaced rather than reused
+                        process.kill()
+                        process.join()
+                        conn.close()
+                        del busy[conn]
+                        done[index] = (item, None, error)
+                        idle.append(self._spawn())
+        finally:
+            # Forked workers hold copies of each other's pipes, so idle ones are told to stop rather than sent EOF
+            for process, conn in idle:
+                try:
+                    conn.send(None)
+                except OSError:
+                    process.kill()
+                conn.close()
+            for conn, (process, _, _, _) in busy.items():
+                process.kill()
+                conn.close()
+            for process, _ in idle:
+                process.join()
+            for process, _, _, _ in busy.values():
+                process.join()
+
+def run_tasks(fn, tasks, workers=1, timeout=None, memory_limit=None):
+    """Yield (task, result, error) for each task, in order, never raising for a failed task.
+
+    A single worker without limits runs tasks in this process; anything else
+    goes through a `SupervisedPool`.
+    """
+    if workers <= 1 and not timeout and not memory_limit:
+        for task in tasks:
+            yield (task, *_call(fn, task))
+        return
+    yield from SupervisedPool(workers, timeout, memory_limit).imap(fn, tasks, workers * 4)
+
+def plan_tasks(directory, matcher, pages_per_task=None, match='report', full_counts=False, finder=None,
+               workers=1, timeout=None, memory_limit=None):
+    """One task per PDF, or one per page range when `pages_per_task` is set.
+
+    Counting pages parses the PDF, so it runs through `run_tasks` under the
+    same limits as the scan; a file whose count fails becomes a single task
+    that reports that failure.
+    """
+    files = ((filename, filepath) for filename, filepath, _ in (finder or PdfFinder()).find(directory))
+    if not pages_per_task:
+        for filename, filepath in files:
+            yield filename, filepath, matcher, 0, None, match, full_counts, None
+        return
+    for (filename, filepath), pages, error in run_tasks(_page_count_task, files, workers, timeout, memory_limit):
+        if error or not pages:
+            yield filename, filepath, matcher, 0, None, match, full_counts, error
+            continue
+        for start in range(0, pages, pages_per_task):
+            yield filename, filepath, matcher, start, start + pages_per_task, match, full_counts, None
+
+def make_record(filename, matcher, hits, pages, pages_read=None, seconds=None, counts_complete=True):
+    """Result record for one file, with keywords in the order they were given.
+
+    `counts_complete` is False when reading stopped early, so `hits` and
+    `pages` only cover the pages read.
+    """
+    found = [keyword for keyword in matcher.keywords if keyword in hits]
+    return {'file': filename, 'keywords': found,
+            'hits': {keyword: hits[keyword] for keyword in found},
+            'pages': {keyword: pages.get(keyword, []) for keyword in found},
+            'pages_read': pages_read, 'seconds': None if seconds is None else round(seconds, 4),
+            'counts_complete': counts_complete}
+
+def _accepts(record, matcher, match):
+    return record['keywords'] and (match != 'all' or len(record['keywords']) == len(matcher.keywords))
+
+def _file_record(filename, matcher, match, results, error=None):
+    if error:
+        return {'file': filename, 'error': error}
+    hits, pages = {}, {}
+    pages_read, seconds, complete = 0, 0.0, True
+    for task_hits, task_pages, task_pages_read, task_seconds, task_complete in results:
+        for keyword, count in task_hits.items():
+            hits[keyword] = hits.get(keyword, 0) + count
+            pages.setdefault(keyword, []).extend(task_pages[keyword])
+        pages_read += task_pages_read
+        seconds += task_seconds
+        complete = complete and task_complete
+    record = make_record(filename, matcher, hits, pages, pages_read, seconds, complete)
+    return record if _accepts(record, matcher, match) else None
+
+def iter_scan_results(directory, keywords, workers=1, pages_per_task=None, match='report', full_counts=False,
+                      finder=None, timeout=None, memory_limit=None):
+    """Yield one result record per matching PDF, in discovery order, as soon as each file is done.
+
+    Files that fail to scan are yielded as {'file': name, 'error': reason}
+    records and the scan carries on. `timeout` (seconds) and `memory_limit`
+    (bytes) apply to each task.
+    """
+    # The matcher is compiled once per run and shipped to every task
+    matcher = KeywordMatcher(keywords)
+    tasks = plan_tasks(directory, matcher, pages_per_task, match, full_counts, finder, workers, timeout, memory_limit)
+    current, results, error = None, [], None
+    # Page-range tasks of one file arrive consecutively and are merged before the file is reported
+    for task, result, task_error in run_tasks(_scan_task, tasks, workers, timeout, memory_limit):
+        filename = task[0]
+        if current != filename:
+            if current is not None:
+                record = _file_record(current, matcher, match, results, error)
+                if record:
+                    yield record
+            current, results, error = filename, [], None
+        if task_error:
+            error = error or task_error
+        else:
+            results.append(result[1])
+    if current is not None:
+        record = _file_record(current, matcher, match, results, error)
+        if record:
+            yield record
+
+def scan_pdfs(directory, keywords, workers=1, pages_per_task=None, match='report', full_counts=False, finder=None):
     matching_files = []
     keyword_data = {}
+    for record in iter_scan_results(directory, keywords, workers, pages_per_task, match, full_counts, finder):
+        if 'error' not in record:
+            matching_files.append(record['file'])
+            keyword_data[record['file']] = record['keywords']
+    return matching_files, keyword_data
+
+def file_sha256(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def extract_pages(filepath):
+    """Return the text of every page of one PDF."""
+    with open(filepath, 'rb') as file:
+        return [page.extract_text() for page in PyPDF2.PdfReader(file).pages]
+
+class PdfIndex:
+    """Persistent SQLite FTS5 index of PDF page text.
+
+    Files are keyed on absolute path, size, mtime and SHA-256. An update only
+    re-extracts files that are new or whose content changed, and it drops
+    files that have disappeared, so repeat queries skip PDF parsing entirely.
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT);
+            CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+                path UNINDEXED, page UNINDEXED, text, tokenize='unicode61');
+        """)
+
+    def update(self, directory, workers=1, finder=None, timeout=None, memory_limit=None):
+        """Bring the index up to date with the PDFs found under `directory`.
+
+        Returns ({path: relative path} of the selected files, number
+        (re)indexed, number removed, {relative path: reason} of files that
+        could not be extracted). Failed files are left out of the index and
+        the selection, and are retried on the next update.
+        """
+        directory = os.path.abspath(directory)
+        known = {path: (size, mtime_ns, sha256) for path, size, mtime_ns, sha256 in
+                 self.db.execute("SELECT path, size, mtime_ns, sha256 FROM files")}
+        selected = {}
+        meta = {}
+
+        def stale_files():
+            for relpath, filepath, stat in (finder or PdfFinder()).find(directory):
+                selected[filepath] = relpath
+                entry = known.get(filepath)
+                if entry and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                sha256 = file_sha256(filepath)
+                if entry and entry[2] == sha256:
+                    self.db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                                    (stat.st_size, stat.st_mtime_ns, filepath))
+                    continue
+                meta[filepath] = (stat.st_size, stat.st_mtime_ns, sha256)
+                yield filepath
+
+        failed = {}
+        for filepath, texts, error in run_tasks(extract_pages, stale_files(), workers, timeout, memory_limit):
+            self._forget(filepath)
+            if error:
+                failed[selected.pop(filepath)] = error
+                del meta[filepath]
+            else:
+                self.db.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (filepath, *meta[filepath]))
+                self.db.executemany("INSERT INTO pages (path, page, text) VALUES (?, ?, ?)",
+                                    ((filepath, number, text) for number, text in enumerate(texts, 1)))
+            self.db.commit()
+
+        removed = [path for path in known
+                   if path.startswith(directory + os.sep) and not os.path.exists(path)]
+        for path in removed:
+            self._forget(path)
+        self.db.commit()
+        return selected, len(meta), len(removed), failed
 
-    for filename in os.listdir(directory):
-        if filename.endswith('.pdf'):
-            filepath = os.path.join(directory, filename)
-            with open(filepath, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ''
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
+    def _forget(self, filepath):
+        self.db.execute("DELETE FROM files WHERE path = ?", (filepath,))
+        self.db.execute("DELETE FROM pages WHERE path = ?", (filepath,))
 
-                found_keywords = []
-                for keyword in keywords:
-                    if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-                        found_keywords.append(keyword)
+    def search(self, matcher, selected):
+        """Yield (relative path, {keyword: hits}, {keyword: [pages]}) for indexed PDFs in `selected`.
 
-                if found_keywords:
-                    matching_files.append(filename)
-                    keyword_data[filename] = found_keywords
+        `selected` maps absolute paths to the names to report, as returned by
+        `update`. FTS5 narrows the search to candidate pages; the matcher then
+        confirms and counts hits on just those pages, with the same rules as a
+        live scan.
+        """
+        if not matcher.keywords:
+            return
+        query = ' OR '.join('"' + keyword.replace('"', '""') + '"' for keyword in matcher.keywords)
+        rows = self.db.execute("SELECT path, page, text FROM pages WHERE pages MATCH ? ORDER BY path, page", (query,))
+        results = {}
+        for path, page, text in rows:
+            if path not in selected:
+                continue
+            hits, pages = results.setdefault(path, ({}, {}))
+            for keyword, count in matcher.counts(text).items():
+                hits[keyword] = hits.get(keyword, 0) + count
+                pages.setdefault(keyword, []).append(page)
+        # Report in discovery order, like a live scan
+        for path, relpath in selected.items():
+            if path in results and results[path][0]:
+                yield (relpath, *results[path])
 
+    def close(self):
+        self.db.close()
+
+def iter_index_results(index_path, directory, keywords, workers=1, match='report', finder=None,
+                       timeout=None, memory_limit=None):
+    """Like `iter_scan_results`, but answered from a persistent index that is refreshed first."""
+    matcher = KeywordMatcher(keywords)
+    index = PdfIndex(index_path)
+    try:
+        selected, changed, removed, failed = index.update(directory, workers, finder, timeout, memory_limit)
+        print(f"Index updated: {changed} file(s) (re)indexed, {removed} removed, {len(failed)} failed.")
+        for filename, error in failed.items():
+            yield {'file': filename, 'error': error}
+        for filename, hits, pages in index.search(matcher, selected):
+            record = make_record(filename, matcher, hits, pages)
+            if _accepts(record, matcher, match):
+                yield record
+    finally:
+        index.close()
+
+def search_index(index_path, directory, keywords, workers=1, match='report', finder=None):
+    matching_files = []
+    keyword_data = {}
+    for record in iter_index_results(index_path, directory, keywords, workers, match, finder):
+        if 'error' not in record:
+            matching_files.append(record['file'])
+            keyword_data[record['file']] = record['keywords']
     return matching_files, keyword_data
 
+OUTPUT_FORMATS = {'.jsonl': 'jsonl', '.csv': 'csv'}
+
+class ResultWriter:
+    """Streams result records to a file as they arrive, flushing after each one.
+
+    'jsonl' writes one JSON object per file, 'csv' one row per file and
+    keyword, and 'dat' keeps the original "file keyword ..." lines. Failed
+    files get an 'error' record in JSONL and CSV; 'dat' has no place for
+    them and leaves them out.
+    """
+
+    def __init__(self, path, fmt=None):
+        self.fmt = fmt or OUTPUT_FORMATS.get(os.path.splitext(path)[1].lower(), 'dat')
+        self._file = open(path, 'w', newline='' if self.fmt == 'csv' else None)
+        if self.fmt == 'csv':
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(['file', 'keyword', 'hits', 'pages', 'pages_read', 'seconds', 'counts_complete', 'error'])
+
+    def write(self, record):
+        if 'error' in record and self.fmt == 'csv':
+            self._csv.writerow([record['file'], '', '', '', '', '', '', record['error']])
+        elif 'error' in record and self.fmt == 'dat':
+            return
+        elif self.fmt == 'jsonl':
+            self._file.write(json.dumps(record) + '\n')
+        elif self.fmt == 'csv':
+            for keyword in record['keywords']:
+                self._csv.writerow([record['file'], keyword, record['hits'][keyword],
+                                    ' '.join(map(str, record['pages'][keyword])),
+                                    '' if record['pages_read'] is None else record['pages_read'],
+                                    '' if record['seconds'] is None else record['seconds'],
+                                    str(record['counts_complete']).lower(), ''])
+        else:
+            self._file.write(f"{record['file']} {' '.join(record['keywords'])}\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
 def main():
-    directory = input("Enter the directory path containing PDF files: ")
-    keywords = input("Enter keywords (separated by commas): ").split(',')
+    parser = argparse.ArgumentParser(description="Scan PDF files in a directory for keywords.")
+    parser.add_argument("directory", nargs="?", help="Directory containing PDF files (prompted for if omitted)")
+    parser.add_argument("-k", "--keywords", help="Comma-separated keywords (prompted for if omitted)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Scan with this many worker processes (default 1)")
+    parser.add_argument("--pages-per-task", type=int, help="Split PDFs into page ranges of this size across workers")
+    parser.add_argument("--match", choices=("report", "any", "all"), default="report",
+                        help="report: list every keyword found (default); any: stop at the first hit; all: require every keyword")
+    parser.add_argument("--full-counts", action="store_true", help="Read every page even after the result is settled")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Also scan subdirectories")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB", help="Only scan PDFs matching this glob (repeatable)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB", help="Skip files and directories matching this glob (repeatable)")
+    parser.add_argument("--min-size", type=int, metavar="BYTES", help="Skip PDFs smaller than this")
+    parser.add_argument("--max-size", type=int, metavar="BYTES", help="Skip PDFs larger than this")
+    parser.add_argument("--index", metavar="DB", help="Answer from a persistent SQLite full-text index, updating it incrementally first")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS", help="Give up on a file (or page range) after this long")
+    parser.add_argument("--max-memory", type=int, metavar="MB", help="Limit each worker process to this much memory")
+    parser.add_argument("-o", "--output", default="keyword_results.dat", help="Results file (default keyword_results.dat)")
+    parser.add_argument("-f", "--format", choices=("dat", "jsonl", "csv"), help="Results format (default: from the extension, .jsonl/.csv, else dat)")
+    args = parser.parse_args()
+    if args.pages_per_task is not None and args.pages_per_task < 1:
+        parser.error("--pages-per-task must be at least 1")
+    if args.max_memory and resource is None:
+        parser.error("--max-memory is not supported on this platform")
+    memory_limit = args.max_memory * 1024 * 1024 if args.max_memory else None
+
+    directory = args.directory or input("Enter the directory path containing PDF files: ")
+    keywords = (args.keywords or input("Enter keywords (separated by commas): ")).split(',')
     keywords = [keyword.strip() for keyword in keywords]
 
-    matching_files, keyword_data = scan_pdfs(directory, keywords)
+    finder = PdfFinder(args.recursive, args.include, args.exclude, args.min_size, args.max_size)
+    writer = ResultWriter(args.output, args.format)
+    # Structured output reports hit counts, so they are made complete unless only the first hit was asked for
+    full_counts = args.full_counts or (writer.fmt != 'dat' and args.match != 'any')
+    if args.index:
+        results = iter_index_results(args.index, directory, keywords, args.jobs, args.match, finder,
+                                     args.timeout, memory_limit)
+    else:
+        results = iter_scan_results(directory, keywords, args.jobs, args.pages_per_task, args.match,
+                                    full_counts, finder, args.timeout, memory_limit)
+
+    # Each match is written as soon as it is found, so an interrupted scan still leaves usable output
+    matching_files = []
+    failures = []
+    try:
+        for record in results:
+            writer.write(record)
+            if 'error' in record:
+                failures.append(record)
+                print(f"Error scanning '{record['file']}': {record['error']}")
+            else:
+                matching_files.append(record['file'])
+    finally:
+        writer.close()
 
     if matching_files:
         print("Matching PDF files:")
         print("{" + ", ".join(matching_files) + "}")
-
-        with open('keyword_results.dat', 'w') as dat_file:
-            for filename, found_keywords in keyword_data.items():
-                dat_file.write(f"{filename} {' '.join(found_keywords)}\n")
-
-        print("Results have been saved to 'keyword_results.dat'")
+        print(f"Results have been saved to '{args.output}'")
     else:
         print("No matching PDF files found.")
+    if failures:
+        print(f"{len(failures)} file(s) could not be scanned; see the errors above.")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import PyPDF2
+import argparse
+import os
+from contextlib import ExitStack
+from pathlib import Path
+
+from split_pdf import (OVERWRITE_POLICIES, StreamingPdfWriter, get_output_file_path, parse_ranges,
+                       report_peak_memory, resolve_output_path)
+
+def parse_input(argument):
+    """
+    Split an input argument into (path, range spec).
+    'report.pdf@1-3,5' -> ('report.pdf', '1-3,5'); a bare path selects every page.
+    """
+    if os.path.exists(argument) or '@' not in argument:
+        return argument, None
+    path, spec = argument.rsplit('@', 1)
+    return path, spec
+
+def assemble_pages(readers, specs):
+    """
+    Build the output page list [(pdf_reader, page number, rotation)] from the
+    inputs in order, each limited to its range spec. Specs may reorder and
+    reverse pages, e.g. '3,1,2' or 'last-1'.
+    """
+    pages = []
+    for pdf_reader, spec in zip(readers, specs):
+        page_count = len(pdf_reader.pages)
+        numbers = parse_ranges(spec, page_count, allow_reverse=True) if spec else range(1, page_count + 1)
+        pages.extend((pdf_reader, page_num, 0) for page_num in numbers)
+    return pages
+
+def edit_pages(pages, delete=None, rotations=()):
+    """
+    Apply deletions and rotations to an assembled page list. Both use
+    output page numbers, counted before anything is deleted, so a spec
+    refers to the same pages whichever option it is given to.
+    """
+    page_count = len(pages)
+    angles = {}
+    for angle, spec in rotations:
+        for page_num in parse_ranges(spec, page_count):
+            angles[page_num] = (angles.get(page_num, 0) + angle) % 360
+    deleted = set(parse_ranges(delete, page_count)) if delete else set()
+    if len(deleted) == page_count:
+        raise ValueError("every page would be deleted")
+    return [(pdf_reader, page_num, angles.get(position, 0))
+            for position, (pdf_reader, page_num, _) in enumerate(pages, 1) if position not in deleted]
+
+def parse_angle(text):
+    angle = int(text)
+    if angle % 90:
+        raise ValueError(f"rotation must be a multiple of 90, not {text}")
+    return angle
+
+def merge_pdfs(inputs, output_pdf, delete=None, rotations=(), overwrite='ask'):
+    """
+    Merge (path, range spec) inputs into output_pdf, then delete and rotate pages.
+    All ranges are validated before anything is written; invalid ones raise ValueError.
+    The output is streamed by StreamingPdfWriter, so identical fonts and images from
+    different inputs are stored once. Returns (output path, pages written, objects
+    deduplicated), or None if the output was skipped.
+    """
+    output_pdf = Path(output_pdf)
+    if overwrite == 'ask':
+        output_pdf = get_output_file_path(output_pdf.parent, output_pdf.stem, suffix=output_pdf.suffix)
+    else:
+        output_pdf = resolve_output_path(output_pdf, overwrite)
+        if output_pdf is None:
+            return None
+
+    with ExitStack() as stack:
+        # Inputs are read from open files, so none is loaded into memory whole. The writer only
+        # replaces output_pdf once it is complete, so the output may be one of the inputs.
+        readers = [PyPDF2.PdfReader(stack.enter_context(open(path, 'rb'))) for path, _ in inputs]
+        pages = assemble_pages(readers, [spec for _, spec in inputs])
+        pages = edit_pages(pages, delete, rotations)
+        pdf_writer = StreamingPdfWriter(output_pdf, pages)
+        pdf_writer.write()
+    return output_pdf, len(pages), pdf_writer.deduplicated
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge PDF files, or reorder, rotate and delete their pages.")
+    parser.add_argument("inputs", nargs="+", metavar="INPUT",
+                        help="Input PDF, optionally with a page range after '@', e.g. report.pdf@1-3,5")
+    parser.add_argument("-o", "--output", required=True, help="Path of the merged PDF")
+    parser.add_argument("-d", "--delete", metavar="PAGES", help="Delete these pages of the merged document")
+    parser.add_argument("--rotate", nargs=2, action="append", default=[], metavar=("ANGLE", "PAGES"),
+                        help="Rotate these pages of the merged document clockwise by ANGLE (repeatable)")
+    parser.add_argument("--overwrite", choices=OVERWRITE_POLICIES, default='ask',
+                        help="What to do if the output file already exists (default: ask)")
+
+    args = parser.parse_args()
+    try:
+        rotations = [(parse_angle(angle), spec) for angle, spec in args.rotate]
+    except ValueError as e:
+        parser.error(f"--rotate: {e}")
+
+    try:
+        result = merge_pdfs([parse_input(argument) for argument in args.inputs], args.output,
+                            args.delete, rotations, args.overwrite)
+    except ValueError as e:
+        print(f"Invalid page ranges: {e}")
+        return
+    except FileExistsError as e:
+        print(f"{e}; stopping (--overwrite error).")
+        return
+    except (OSError, PyPDF2.errors.PdfReadError) as e:
+        print(f"Error merging: {e}")
+        return
+
+    if result is None:
+        print(f"Skipped (already exists): {args.output}")
+    else:
+        output_pdf, page_count, deduplicated = result
+        print(f"Created: {output_pdf} ({page_count} pages, {deduplicated} duplicate objects merged)")
+    report_peak_memory(True)
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ setup(
     entry_points={
         'console_scripts': [
             'pdf-split=pdf_splitter:main',
+            'pdf-merge=merge_pdf:main',
         ],
     },
     classifiers=[
@@ -2,27 +2,191 @@
 
 import PyPDF2
 import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
 from pathlib import Path
+from PyPDF2.generic import (ArrayObject, DecodedStreamObject, DictionaryObject, EncodedStreamObject,
+                            IndirectObject, NameObject, NullObject, NumberObject, StreamObject)
 
-def parse_ranges(ranges):
+try:
+    import resource
+except ImportError:  # not available on Windows; peak memory is then not reported
+    resource = None
+
+OVERWRITE_POLICIES = ('ask', 'overwrite', 'skip', 'rename', 'error')
+RANGE_TERM = re.compile(r'^(?:(?P<keyword>all|odd|even)'
+                        r'|(?P<start>\d+|last)?(?P<dash>-)(?P<end>\d+|last)?'
+                        r'|(?P<page>\d+|last))'
+                        r'(?::(?P<step>\d+))?$')
+# Rough per-page bytes for the page dictionary and cross-reference entries
+PAGE_OVERHEAD = 300
+
+def parse_ranges(ranges, page_count, allow_reverse=False):
     """
-    Parse a range string into a list of pages.
+    Parse a range string into a list of pages, validated against page_count.
     For example, '1-3,5,7-9' -> [1, 2, 3, 5, 7, 8, 9]
+
+    Terms are separated by commas:
+      N       a single page ('last' is the final page)
+      A-B     pages A to B; 'A-' runs to the end and '-B' starts at page 1
+      all, odd, even
+      T:S     every S-th page of term T, e.g. '1-:10' -> 1, 11, 21, ...
+    Raises ValueError for malformed terms, pages outside 1..page_count,
+    reversed ranges (unless allow_reverse) and pages listed twice.
     """
     result = []
+    seen = set()
     for part in ranges.split(','):
-        if '-' in part:
-            start, end = part.split('-')
-            result.extend(range(int(start), int(end) + 1))
+        part = part.strip().lower()
+        match = RANGE_TERM.match(part)
+        if not match:
+            raise ValueError(f"invalid page range '{part}'")
+        step = int(match['step']) if match['step'] else 1
+        if step < 1:
+            raise ValueError(f"step must be at least 1 in '{part}'")
+
+        if match['keyword']:
+            start, end = (2, page_count) if match['keyword'] == 'even' else (1, page_count)
+            step *= 1 if match['keyword'] == 'all' else 2
+        elif match['dash']:
+            start = _page_number(match['start'] or '1', page_count, part)
+            end = _page_number(match['end'] or 'last', page_count, part)
         else:
-            result.append(int(part))
+            start = end = _page_number(match['page'], page_count, part)
+
+        if start > end and not allow_reverse:
+            raise ValueError(f"range '{part}' is reversed")
+        pages = range(start, end + 1, step) if start <= end else range(start, end - 1, -step)
+        for page in pages:
+            if page in seen:
+                raise ValueError(f"page {page} is listed more than once in '{ranges}'")
+            seen.add(page)
+            result.append(page)
     return result
 
-def get_output_file_path(base_path, base_name, index=None):
+def _page_number(token, page_count, part):
+    page = page_count if token == 'last' else int(token)
+    if not 1 <= page <= page_count:
+        raise ValueError(f"page {page} in '{part}' is out of range (the document has {page_count} pages)")
+    return page
+
+def parse_outputs(spec, page_count):
+    """
+    Parse a multi-output spec: one range string per output file, separated by ';'.
+    For example, '1-3,5;6-' -> [[1, 2, 3, 5], [6, 7, ..., page_count]]
+    """
+    outputs = [part for part in spec.split(';') if part.strip()]
+    if not outputs:
+        raise ValueError("no page ranges given")
+    return [parse_ranges(part, page_count) for part in outputs]
+
+def chunk_pages(page_count, every):
+    """Split pages 1..page_count into consecutive outputs of `every` pages."""
+    if every < 1:
+        raise ValueError("chunk size must be at least 1")
+    return [list(range(start, min(start + every, page_count + 1))) for start in range(1, page_count + 1, every)]
+
+def _stream_size(obj):
+    # PyPDF2 drops /Length when it reads a stream and keeps the still-encoded bytes in _data
+    data = getattr(obj.get_object(), '_data', None)
+    return len(data) if data is not None else 0
+
+def _object_key(ref):
+    return (ref.idnum, ref.generation) if isinstance(ref, PyPDF2.generic.IndirectObject) else id(ref)
+
+def _font_file(font):
+    if '/DescendantFonts' in font:
+        font = font['/DescendantFonts'][0].get_object()
+    descriptor = font.get('/FontDescriptor')
+    if descriptor is None:
+        return None
+    descriptor = descriptor.get_object()
+    for key in ('/FontFile', '/FontFile2', '/FontFile3'):
+        if key in descriptor:
+            return descriptor.raw_get(key)
+    return None
+
+def _page_cost(page):
+    """
+    Estimate what a page adds to a PDF: (size of its own content streams,
+    {object key: size} of the images, forms and embedded fonts it uses).
+    Sizes are compressed stream lengths, so no stream is decoded.
+    """
+    contents = page.get('/Contents')
+    contents = contents.get_object() if contents is not None else []
+    own = sum(map(_stream_size, contents)) if isinstance(contents, list) else _stream_size(contents)
+
+    shared = {}
+    resources = page.get('/Resources')
+    resources = resources.get_object() if resources is not None else {}
+    xobjects = resources.get('/XObject')
+    for ref in (xobjects.get_object().values() if xobjects is not None else []):
+        shared[_object_key(ref)] = _stream_size(ref)
+    fonts = resources.get('/Font')
+    for ref in (fonts.get_object().values() if fonts is not None else []):
+        font_file = _font_file(ref.get_object())
+        if font_file is not None:
+            shared[_object_key(font_file)] = _stream_size(font_file)
+    return own + PAGE_OVERHEAD, shared
+
+def chunk_by_size(pdf_reader, max_bytes):
+    """
+    Split a document into consecutive outputs of at most about `max_bytes`.
+    Each image, form and embedded font is counted once per output, as it is
+    written once. A page too large on its own gets an output to itself.
+    """
+    chunks = []
+    current, seen, size = [], set(), 0
+    for page_num, page in enumerate(pdf_reader.pages, 1):
+        own, shared = _page_cost(page)
+        cost = own + sum(length for key, length in shared.items() if key not in seen)
+        if current and size + cost > max_bytes:
+            chunks.append(current)
+            current, seen, size = [], set(), 0
+            cost = own + sum(shared.values())
+        current.append(page_num)
+        seen.update(shared)
+        size += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+def parse_size(text):
+    """Parse a size such as '500000', '800K', '20MB' or '1.5G' into bytes."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*', text.lower())
+    if not match:
+        raise ValueError(f"invalid size '{text}'")
+    return int(float(match[1]) * 1024 ** ' kmg'.index(match[2] or ' '))
+
+def plan_outputs(pdf_reader, page_ranges=None, every=None, max_size=None):
+    """
+    Turn a split request into a list of page lists, validated before anything is written.
+    `page_ranges` is a spec string (see parse_outputs) or a list of page lists.
+    """
+    page_count = len(pdf_reader.pages)
+    if every:
+        return chunk_pages(page_count, every)
+    if max_size:
+        return chunk_by_size(pdf_reader, max_size)
+    if isinstance(page_ranges, str):
+        return parse_outputs(page_ranges, page_count)
+    for pages in page_ranges:
+        for page in pages:
+            if not 1 <= page <= page_count:
+                raise ValueError(f"page {page} is out of range (the document has {page_count} pages)")
+    return page_ranges
+
+def get_output_file_path(base_path, base_name, index=None, suffix='.pdf'):
     if index is None:
-        output_pdf = base_path / f"{base_name}.pdf"
+        output_pdf = base_path / f"{base_name}{suffix}"
     else:
-        output_pdf = base_path / f"{base_name}_{index + 1}.pdf"
+        output_pdf = base_path / f"{base_name}_{index + 1}{suffix}"
     
     if output_pdf.exists():
         while True:
@@ -31,42 +195,356 @@ def get_output_file_path(base_path, base_name, index=None):
                 return output_pdf
             elif overwrite == 'no':
                 new_name = input("Enter a new base name for the split PDF files: ")
-                return get_output_file_path(base_path, new_name, index)
+                return get_output_file_path(base_path, new_name, index, suffix)
             else:
                 print("Please answer 'yes' or 'no'.")
     return output_pdf
 
-def split_pdf(input_pdf, page_ranges, base_name):
+def resolve_output_path(output_pdf, overwrite):
+    """
+    Apply a non-interactive overwrite policy to an output path.
+    Returns the path to write, or None if the output should be skipped.
+    """
+    if not output_pdf.exists() or overwrite == 'overwrite':
+        return output_pdf
+    if overwrite == 'skip':
+        return None
+    if overwrite == 'error':
+        raise FileExistsError(f"File {output_pdf} already exists")
+    # 'rename': pick the first free "name (n).pdf"
+    n = 2
+    while True:
+        candidate = output_pdf.with_name(f"{output_pdf.stem} ({n}){output_pdf.suffix}")
+        if not candidate.exists():
+            return candidate
+        n += 1
+
+@contextmanager
+def replacing(output_pdf):
+    """
+    Open a temporary file next to output_pdf and move it over output_pdf once it is
+    fully written. Inputs are read lazily from open files, so an output that is also
+    an input must not be truncated while its pages are still being copied.
+    """
+    output_pdf = Path(output_pdf)
+    temp_pdf = output_pdf.with_name(f".{output_pdf.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_pdf, 'wb') as output_file:
+            yield output_file
+        os.replace(temp_pdf, output_pdf)
+    except BaseException:
+        temp_pdf.unlink(missing_ok=True)
+        raise
+
+def _ref_key(pdf_reader, ref):
+    return id(pdf_reader), ref.idnum, ref.generation
+
+def _page_ref(page):
+    return getattr(page, 'indirect_reference', None) or page.indirect_ref
+
+class StreamingPdfWriter:
+    """
+    Write pages from one or more PdfReaders straight to disk, one object at a time.
+
+    `pages` lists (pdf_reader, page number, extra rotation) in output order.
+    Each page and the objects it uses are written as soon as the page is
+    reached, and the readers' object caches are emptied after every page,
+    so memory holds little more than the cross-reference offsets.
+
+    Objects are content-addressed: after its references are renumbered,
+    an object identical to one already written (the same font or image,
+    even from another input) reuses that copy. Links to pages that are not
+    part of the output are dropped.
+    """
+
+    def __init__(self, output_pdf, pages):
+        self._pages = list(pages)
+        self._output_pdf = output_pdf
+        self._offsets = [None]  # indexed by object number
+        self._numbers = {}      # (reader, idnum, generation) -> object number in the output
+        self._digests = {}      # sha256 of a written object -> its object number
+        self._in_progress = set()
+        self._reader_pages = {}
+        self.deduplicated = 0
+        self._root = self._allocate()
+        # Output pages are numbered up front so that links between them survive
+        self._kids = [self._allocate() for _ in self._pages]
+        for (pdf_reader, page_num, _), number in zip(self._pages, self._kids):
+            self._numbers.setdefault(_ref_key(pdf_reader, _page_ref(pdf_reader.pages[page_num - 1])), number)
+
+    def _allocate(self):
+        self._offsets.append(None)
+        return len(self._offsets) - 1
+
+    def _is_page(self, pdf_reader, key):
+        if id(pdf_reader) not in self._reader_pages:
+            self._reader_pages[id(pdf_reader)] = {_ref_key(pdf_reader, _page_ref(page)) for page in pdf_reader.pages}
+        return key in self._reader_pages[id(pdf_reader)]
+
+    def _reference(self, pdf_reader, ref):
+        # Output object number for a source reference; the object and its children are written first
+        key = _ref_key(pdf_reader, ref)
+        if key in self._numbers:
+            return self._numbers[key]
+        if self._is_page(pdf_reader, key):
+            return None
+        if key in self._in_progress:
+            # A cycle: number it now and write it, without deduplication, once its children are done
+            self._numbers[key] = self._allocate()
+            return self._numbers[key]
+        self._in_progress.add(key)
+        obj = pdf_reader.get_object(ref)
+        converted = self._convert(pdf_reader, obj) if obj is not None else NullObject()
+        self._in_progress.discard(key)
+        if key in self._numbers:
+            self._write(self._numbers[key], converted)
+            return self._numbers[key]
+
+        data = BytesIO()
+        converted.write_to_stream(data, None)
+        digest = hashlib.sha256(data.getbuffer()).digest()
+        if digest in self._digests:
+            self.deduplicated += 1
+        else:
+            self._digests[digest] = self._allocate()
+            self._write(self._digests[digest], data.getvalue())
+        self._numbers[key] = self._digests[digest]
+        return self._numbers[key]
+
+    def _convert(self, pdf_reader, obj):
+        # Copy an object with its references renumbered
+        if isinstance(obj, IndirectObject):
+            number = self._reference(pdf_reader, obj)
+            return IndirectObject(number, 0, None) if number is not None else NullObject()
+        if isinstance(obj, StreamObject):
+            copy = EncodedStreamObject() if '/Filter' in obj else DecodedStreamObject()
+            copy._data = obj._data
+            copy.update((key, self._convert(pdf_reader, value)) for key, value in obj.items())
+            return copy
+        if isinstance(obj, DictionaryObject):
+            return DictionaryObject((key, self._convert(pdf_reader, value)) for key, value in obj.items())
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._convert(pdf_reader, value) for value in obj)
+        return obj
+
+    def _write(self, number, obj):
+        self._offsets[number] = self._file.tell()
+        self._file.write(f"{number} 0 obj\n".encode())
+        if isinstance(obj, bytes):
+            self._file.write(obj)
+        else:
+            obj.write_to_stream(self._file, None)
+        self._file.write(b"\nendobj\n")
+
+    def write(self):
+        readers = {id(pdf_reader): pdf_reader for pdf_reader, _, _ in self._pages}.values()
+        with replacing(self._output_pdf) as self._file:
+            self._file.write(b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n')
+            for (pdf_reader, page_num, rotation), number in zip(self._pages, self._kids):
+                page = pdf_reader.pages[page_num - 1]
+                page_copy = DictionaryObject((key, self._convert(pdf_reader, value))
+                                             for key, value in page.items() if key != '/Parent')
+                page_copy[NameObject('/Parent')] = IndirectObject(self._root, 0, None)
+                if rotation:
+                    page_copy[NameObject('/Rotate')] = NumberObject((int(page['/Rotate'] if '/Rotate' in page else 0) + rotation) % 360)
+                self._write(number, page_copy)
+                # Everything this page needed is on disk; shared objects are recognised by their numbers or digests
+                for reader in readers:
+                    reader.resolved_objects.clear()
+            self._write_trailer()
+
+    def _write_trailer(self):
+        self._write(self._root, DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(IndirectObject(number, 0, None) for number in self._kids),
+            NameObject('/Count'): NumberObject(len(self._kids)),
+        }))
+        catalog = self._allocate()
+        self._write(catalog, DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): IndirectObject(self._root, 0, None),
+        }))
+        xref = self._file.tell()
+        self._file.write(f"xref\n0 {len(self._offsets)}\n0000000000 65535 f \n".encode())
+        self._file.write(''.join(f"{offset:010d} 00000 n \n" for offset in self._offsets[1:]).encode())
+        self._file.write(f"trailer\n<< /Size {len(self._offsets)} /Root {catalog} 0 R >>\n"
+                         f"startxref\n{xref}\n%%EOF\n".encode())
+
+def write_part(pdf_reader, pages, output_pdf, low_memory=False):
+    if low_memory:
+        StreamingPdfWriter(output_pdf, [(pdf_reader, page_num, 0) for page_num in pages]).write()
+        return
+    pdf_writer = PyPDF2.PdfWriter()
+    for page_num in pages:
+        pdf_writer.add_page(pdf_reader.pages[page_num - 1])
+    with replacing(output_pdf) as output_file:
+        pdf_writer.write(output_file)
+
+def peak_memory():
+    """
+    Peak resident memory in bytes of this process and of any finished worker
+    processes, or None where it cannot be measured.
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def split_pdf(input_pdf, page_ranges, base_name, overwrite='ask', every=None, max_size=None, low_memory=False):
     """
     Split the input PDF into multiple PDFs based on the page_ranges and save them to the same directory as input_pdf.
     Each new PDF file will be named based on the provided base_name.
+    page_ranges is a spec string like '1-3,5;6-' or a list of page lists; `every` (pages) or
+    `max_size` (bytes) split the whole document into consecutive chunks instead.
+    All ranges are validated before any file is written; invalid ones raise ValueError.
+    Existing files are handled according to `overwrite` (see OVERWRITE_POLICIES); 'ask' prompts.
+    With low_memory, pages are streamed to disk by StreamingPdfWriter.
     """
-    pdf_reader = PyPDF2.PdfReader(input_pdf)
-    input_pdf_path = Path(input_pdf)
-    output_dir = input_pdf_path.parent
+    # Reading from an open file (rather than a path, which PyPDF2 loads whole) keeps the input on disk
+    with open(input_pdf, 'rb') as input_file:
+        pdf_reader = PyPDF2.PdfReader(input_file)
+        page_ranges = plan_outputs(pdf_reader, page_ranges, every, max_size)
+        input_pdf_path = Path(input_pdf)
+        output_dir = input_pdf_path.parent
 
-    for idx, pages in enumerate(page_ranges):
-        pdf_writer = PyPDF2.PdfWriter()
-        for page_num in pages:
-            pdf_writer.add_page(pdf_reader.pages[page_num - 1])
-        output_pdf = get_output_file_path(output_dir, base_name, idx if len(page_ranges) > 1 else None)
-        with open(output_pdf, 'wb') as output_file:
-            pdf_writer.write(output_file)
-        print(f"Created: {output_pdf}")
+        for idx, pages in enumerate(page_ranges):
+            index = idx if len(page_ranges) > 1 else None
+            if overwrite == 'ask':
+                output_pdf = get_output_file_path(output_dir, base_name, index)
+            else:
+                name = base_name if index is None else f"{base_name}_{index + 1}"
+                output_pdf = resolve_output_path(output_dir / f"{name}.pdf", overwrite)
+                if output_pdf is None:
+                    print(f"Skipped (already exists): {output_dir / name}.pdf")
+                    continue
+            write_part(pdf_reader, pages, output_pdf, low_memory)
+            print(f"Created: {output_pdf}")
+
+def load_manifest(manifest_path):
+    """
+    Read a JSON batch manifest into a list of jobs, one per input file.
+
+    The manifest is a list of {"input": path, "output_dir": path (optional),
+    "outputs": [{"pages": "1-3,5", "name": "part"}, ...]} entries. Relative
+    paths are taken relative to the manifest, outputs default to the input's
+    directory, and an output without a name is called "<input>_<n>". Entries
+    for the same input are merged so each source is opened only once.
+    """
+    manifest_path = Path(manifest_path)
+    with open(manifest_path) as file:
+        entries = json.load(file)
+
+    jobs = {}
+    for entry in entries:
+        input_pdf = manifest_path.parent / entry['input']
+        output_dir = manifest_path.parent / entry['output_dir'] if 'output_dir' in entry else input_pdf.parent
+        outputs = jobs.setdefault(str(input_pdf), [])
+        for output in entry['outputs']:
+            name = output.get('name') or f"{input_pdf.stem}_{len(outputs) + 1}"
+            outputs.append((output['pages'], str(output_dir / f"{name}.pdf")))
+    return list(jobs.items())
+
+def run_job(job, overwrite='skip', low_memory=False):
+    """
+    Write every output of one manifest job from a single PdfReader.
+    Returns (input, [(output, status)], error); a failure stops only this input.
+    """
+    input_pdf, outputs = job
+    results = []
+    try:
+        with open(input_pdf, 'rb') as input_file:
+            pdf_reader = PyPDF2.PdfReader(input_file)
+            # Every range is checked against the page count before the first output is written
+            page_count = len(pdf_reader.pages)
+            planned = [(parse_ranges(ranges, page_count), output_pdf) for ranges, output_pdf in outputs]
+            for pages, output_pdf in planned:
+                path = resolve_output_path(Path(output_pdf), overwrite)
+                if path is None:
+                    results.append((output_pdf, 'Skipped (already exists)'))
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                write_part(pdf_reader, pages, path, low_memory)
+                results.append((str(path), 'Created'))
+    except Exception as e:
+        return input_pdf, results, f"{type(e).__name__}: {e}"
+    return input_pdf, results, None
+
+def _run_job_task(task):
+    return run_job(*task)
+
+def split_batch(jobs, workers=1, overwrite='skip', low_memory=False):
+    """
+    Run manifest jobs, different input files in parallel worker processes.
+    Results are yielded in manifest order.
+    """
+    tasks = [(job, overwrite, low_memory) for job in jobs]
+    if workers <= 1:
+        yield from map(_run_job_task, tasks)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        yield from pool.map(_run_job_task, tasks)
+
+def report_peak_memory(enabled):
+    peak = peak_memory() if enabled else None
+    if peak is not None:
+        print(f"Peak memory: {peak / (1024 * 1024):.1f} MB")
 
 def main():
     parser = argparse.ArgumentParser(description="Split a PDF file into multiple PDFs based on specified page ranges.")
-    parser.add_argument("input_pdf", help="Path to the input PDF file.")
+    parser.add_argument("input_pdf", nargs="?", help="Path to the input PDF file.")
+    parser.add_argument("-r", "--ranges", help="Page ranges, one output per ';', e.g. '1-20,22;25-' (prompted for if omitted)")
+    parser.add_argument("--every", type=int, metavar="N", help="Split the whole document into files of N pages")
+    parser.add_argument("--max-size", type=parse_size, metavar="SIZE", help="Split the whole document into files of about SIZE (e.g. 20MB)")
+    parser.add_argument("-n", "--name", help="Base name for the split PDF files (prompted for if omitted)")
+    parser.add_argument("-m", "--manifest", help="JSON manifest of many input files and their outputs (batch mode)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Split this many input files in parallel in batch mode (default 1)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Stream pages to disk for very large inputs, and report peak memory")
+    parser.add_argument("--overwrite", choices=OVERWRITE_POLICIES,
+                        help="What to do with existing output files (default: ask, or skip in batch mode)")
 
     args = parser.parse_args()
+    if args.every is not None and args.every < 1:
+        parser.error("--every must be at least 1")
+
+    if args.manifest:
+        if args.overwrite == 'ask':
+            parser.error("--overwrite ask is not available in batch mode")
+        failed = 0
+        for input_pdf, results, error in split_batch(load_manifest(args.manifest), args.jobs, args.overwrite or 'skip',
+                                                         args.low_memory):
+            for output_pdf, status in results:
+                print(f"{status}: {output_pdf}")
+            if error:
+                failed += 1
+                print(f"Error splitting '{input_pdf}': {error}")
+        if failed:
+            print(f"{failed} input file(s) could not be split.")
+        report_peak_memory(args.low_memory)
+        return
+
+    if not args.input_pdf:
+        parser.error("an input PDF or --manifest is required")
 
     # Prompt for page ranges and base name
-    page_ranges_input = input("Enter the page ranges (e.g., '1-20,22,25-30'): ")
-    base_name = input("Enter the base name for the split PDF files: ")
+    page_ranges_input = None
+    if not (args.every or args.max_size):
+        page_ranges_input = args.ranges or input("Enter the page ranges, one output per ';' (e.g., '1-20,22;25-30'): ")
+    base_name = args.name or input("Enter the base name for the split PDF files: ")
 
-    # Parse the page ranges
-    page_ranges = [parse_ranges(r) for r in page_ranges_input.split(',')]
-    split_pdf(args.input_pdf, page_ranges, base_name)
+    # The ranges are parsed and checked against the document inside split_pdf, before anything is written
+    try:
+        split_pdf(args.input_pdf, page_ranges_input, base_name, args.overwrite or 'ask', args.every, args.max_size,
+                  args.low_memory)
+    except ValueError as e:
+        print(f"Invalid page ranges: {e}")
+    except FileExistsError as e:
+        print(f"{e}; stopping (--overwrite error).")
+    except (OSError, PyPDF2.errors.PdfReadError) as e:
+        print(f"Error splitting: {e}")
+    report_peak_memory(args.low_memory)
 
 if __name__ == "__main__":
     main()
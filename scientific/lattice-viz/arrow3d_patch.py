@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.artist import Artist
 from matplotlib.text import Annotation
 from matplotlib.patches import FancyArrowPatch
 from mpl_toolkits.mplot3d.proj3d import proj_transform
@@ -15,10 +16,63 @@ class Annotation3D(Annotation):
         self.xy = (x2, y2)
         super().draw(renderer)
 
+class Annotation3DLayer(Artist):
+    """All 3D annotations of one axes, projected together.
+
+    Label positions are recomputed in a single `proj_transform` call only when
+    the axes view matrix changes, and labels outside the figure are skipped.
+    """
+    def __init__(self):
+        super().__init__()
+        self._annotations = []
+        self._xyz = np.empty((0, 3))
+        self._xy = np.empty((0, 2))
+        self._cached_M = None
+
+    def add(self, text, xyz, *args, **kwargs):
+        annotation = Annotation(text, xy=(0, 0), *args, **kwargs)
+        annotation.axes = self.axes
+        annotation.set_figure(self.figure)
+        self._annotations.append(annotation)
+        self._xyz = np.vstack([self._xyz, np.asarray(xyz, dtype=float)])
+        self._cached_M = None
+        self.stale = True
+        return annotation
+
+    def _project(self):
+        if self._cached_M is not None and np.array_equal(self._cached_M, self.axes.M):
+            return
+        xs, ys, _ = proj_transform(*self._xyz.T, self.axes.M)
+        self._xy = np.column_stack([xs, ys])
+        for annotation, xy in zip(self._annotations, self._xy):
+            annotation.xy = tuple(xy)
+        self._cached_M = self.axes.M.copy()
+
+    def draw(self, renderer):
+        if not self.get_visible() or not self._annotations:
+            return
+        self._project()
+        display = self.axes.transData.transform(self._xy)
+        bbox = self.figure.bbox
+        on_screen = ((display[:, 0] >= bbox.x0) & (display[:, 0] <= bbox.x1) &
+                     (display[:, 1] >= bbox.y0) & (display[:, 1] <= bbox.y1))
+        for annotation, visible in zip(self._annotations, on_screen):
+            if visible:
+                annotation.draw(renderer)
+        self.stale = False
+
+def _annotation3D_layer(ax):
+    """Return the shared `Annotation3DLayer` of an `Axes3D`, creating it if needed."""
+    layer = getattr(ax, '_annotation3D_layer', None)
+    if layer is None:
+        layer = Annotation3DLayer()
+        ax.add_artist(layer)
+        ax._annotation3D_layer = layer
+    return layer
+
 def _annotate3D(ax, text, xyz, *args, **kwargs):
     """Add annotation `text` to an `Axes3d` instance."""
-    annotation = Annotation3D(text, xyz, *args, **kwargs)
-    ax.add_artist(annotation)
+    return _annotation3D_layer(ax).add(text, xyz, *args, **kwargs)
 
 setattr(Axes3D, 'annotate3D', _annotate3D)
 
@@ -53,3 +107,67 @@ def _arrow3D(ax, x, y, z, dx, dy, dz, *args, **kwargs):
     ax.add_artist(arrow)
 
 setattr(Axes3D, 'arrow3D', _arrow3D)
+
+class Arrow3DCollection(Artist):
+    """Many 3D arrows drawn as one artist.
+
+    All start and end points are projected in a single `proj_transform` call,
+    and the result is cached until the axes view matrix changes.
+    """
+    def __init__(self, xyz, dxdydz, colors=None, **kwargs):
+        super().__init__()
+        self._arrow_kwargs = kwargs
+        self._colors = colors
+        self.set_data(xyz, dxdydz)
+
+    def set_data(self, xyz, dxdydz):
+        starts = np.atleast_2d(np.asarray(xyz, dtype=float))
+        ends = starts + np.atleast_2d(np.asarray(dxdydz, dtype=float))
+        self._points = np.vstack([starts, ends])
+        self._n = len(starts)
+        self._arrows = None
+        self._cached_M = None
+        self.stale = True
+
+    def _build_arrows(self):
+        self._arrows = []
+        for i in range(self._n):
+            kwargs = dict(self._arrow_kwargs)
+            if self._colors is not None:
+                kwargs.setdefault('ec', self._colors[i])
+                kwargs.setdefault('fc', self._colors[i])
+            arrow = FancyArrowPatch((0, 0), (0, 0), **kwargs)
+            arrow.axes = self.axes
+            arrow.set_figure(self.figure)
+            arrow.set_transform(self.axes.transData)
+            self._arrows.append(arrow)
+
+    def _project(self):
+        if self._cached_M is not None and np.array_equal(self._cached_M, self.axes.M):
+            return
+        xs, ys, self._zs = proj_transform(*self._points.T, self.axes.M)
+        for i, arrow in enumerate(self._arrows):
+            arrow.set_positions((xs[i], ys[i]), (xs[i + self._n], ys[i + self._n]))
+        self._cached_M = self.axes.M.copy()
+
+    def do_3d_projection(self, renderer=None):
+        if self._arrows is None:
+            self._build_arrows()
+        self._project()
+        return np.min(self._zs) if self._n else np.nan
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        self.do_3d_projection(renderer)
+        for arrow in self._arrows:
+            arrow.draw(renderer)
+        self.stale = False
+
+def _arrows3D(ax, xyz, dxdydz, *args, **kwargs):
+    """Add a batch of 3D arrows to an `Axes3D` instance."""
+    arrows = Arrow3DCollection(xyz, dxdydz, *args, **kwargs)
+    ax.add_artist(arrows)
+    return arrows
+
+setattr(Axes3D, 'arrows3D', _arrows3D)
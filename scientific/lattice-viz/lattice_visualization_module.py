@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import arrow3d_patch as arrow3d
 
 fig = plt.figure()
@@ -49,15 +50,54 @@ def plot_lattice(lat):
     else:
         print('Undefined lattice')
 
-def plot_plane(plane, color, step=0.25, fig=fig, ax=ax, label=None):
+CUBE_VERTICES = np.array([[i, j, k] for i in (0, 1) for j in (0, 1) for k in (0, 1)], dtype=float)
+CUBE_EDGES = np.array([(i, j) for i in range(8) for j in range(i + 1, 8)
+                       if np.abs(CUBE_VERTICES[i] - CUBE_VERTICES[j]).sum() == 1])
+
+def plane_polygon(plane, tol=1e-9):
+    """Clip the Miller plane (hkl) against the unit cell and return its polygon.
+
+    The plane satisfies h*x + k*y + l*z = 1 with the origin moved to the
+    opposite cell corner along every axis with a negative index, so zero and
+    negative indices are handled without dividing by the index.  Returns an
+    (N, 3) array of vertices in winding order, or an empty array when the
+    plane does not cut the cell.
+    """
+    normal = np.asarray(plane, dtype=float)
+    if not normal.any():
+        raise ValueError('Miller indices cannot all be zero')
+    origin = (normal < 0).astype(float)
+    d = 1 + normal @ origin
+
+    f = CUBE_VERTICES @ normal - d
+    f[np.abs(f) < tol] = 0
+    f0, f1 = f[CUBE_EDGES[:, 0]], f[CUBE_EDGES[:, 1]]
+    crossing = (f0 * f1 <= 0) & (f0 != f1)
+    p0 = CUBE_VERTICES[CUBE_EDGES[crossing, 0]]
+    p1 = CUBE_VERTICES[CUBE_EDGES[crossing, 1]]
+    t = (f0[crossing] / (f0[crossing] - f1[crossing]))[:, None]
+    points = np.vstack([p0 + t * (p1 - p0), CUBE_VERTICES[f == 0]])
+    points = np.unique(np.round(points, 9), axis=0)
+    if len(points) < 3:
+        return np.empty((0, 3))
+
+    # Order the vertices by angle around their centroid within the plane.
+    centroid = points.mean(axis=0)
+    u = points[0] - centroid
+    u /= np.linalg.norm(u)
+    v = np.cross(normal / np.linalg.norm(normal), u)
+    rel = points - centroid
+    return points[np.argsort(np.arctan2(rel @ v, rel @ u))]
+
+def plot_plane(plane, color, fig=fig, ax=ax, label=None):
     a, b, c = plane
     ax.arrow3D(0, 0, 0, a, b, c, mutation_scale=20, ec=color, fc=color)
-    x_range = np.arange(0 if a >= 0 else -1, 1 + step, step)
-    y_range = np.arange(0 if b >= 0 else -1, 1 + step, step)
-    X, Y = np.meshgrid(x_range, y_range)
-    Z = (1 - X/a - Y/b) * c
-    Z[Z > 1] = np.nan
-    ax.plot_surface(X, Y, Z, alpha=0.5, label=label)
+    polygon = plane_polygon(plane)
+    if len(polygon) == 0:
+        print(f'Plane {tuple(plane)} does not intersect the unit cell')
+        return
+    surface = Poly3DCollection([polygon], alpha=0.5, facecolor=color, label=label)
+    ax.add_collection3d(surface)
 
 def plot_vector(vector, color, fig=fig, ax=ax, label=None):
     a, b, c = vector
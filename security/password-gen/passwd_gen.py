@@ -2,36 +2,303 @@ import string
 import argparse
 import secrets
 import math
+import csv
+import json
+import mmap
+import sys
+from array import array
+
+MIN_LENGTH = 12
+RANDOM_BLOCK_SIZE = 1 << 16
+
+COMMON_PASSWORDS = (
+    "123456", "password", "12345678", "qwerty", "123456789", "12345", "1234", "111111",
+    "1234567", "dragon", "123123", "baseball", "abc123", "football", "monkey", "letmein",
+    "shadow", "master", "666666", "qwertyuiop", "123321", "mustang", "1234567890", "michael",
+    "654321", "superman", "1qaz2wsx", "7777777", "121212", "000000", "qazwsx", "123qwe",
+    "killer", "trustno1", "jordan", "jennifer", "zxcvbnm", "asdfgh", "hunter", "buster",
+    "soccer", "harley", "batman", "andrew", "tigger", "sunshine", "iloveyou", "2000",
+    "charlie", "robert", "thomas", "hockey", "ranger", "daniel", "starwars", "klaster",
+    "112233", "george", "computer", "michelle", "jessica", "pepper", "1111", "zxcvbn",
+    "555555", "11111111", "131313", "freedom", "777777", "pass", "maggie", "159753",
+    "aaaaaa", "ginger", "princess", "joshua", "cheese", "amanda", "summer", "love",
+    "ashley", "nicole", "chelsea", "biteme", "matthew", "access", "yankees", "987654321",
+    "dallas", "austin", "thunder", "taylor", "matrix", "admin", "welcome", "login",
+    "secret", "winter", "spring", "autumn", "hello", "flower", "purple", "orange",
+)
+KEYBOARD_ROWS = ("`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./")
+KEYBOARD_ROW_OFFSETS = (0, 1.5, 1.75, 2.25)
+UNLEET_TABLE = str.maketrans("4@310!5$789", "aaeioisstbg")
+BRUTEFORCE_CARDINALITY = {'lower': 26, 'upper': 26, 'digit': 10, 'symbol': 33}
+STRENGTH_LABELS = ((28, "very weak"), (36, "weak"), (60, "reasonable"), (128, "strong"))
 
 def calculate_entropy(length, character_set_size):
     """Calculate the entropy of a password in bits."""
     return length * math.log2(character_set_size)
 
-def generate_password(length, use_case_variance, use_numbers, use_special):
-    # Enforce minimum length
-    if length < 12:
-        print("Error: Password length must be at least 12 characters.")
-        return None
+def _binomial_log2_pmf(k, n, p):
+    return (math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+            + k * math.log(p) + (n - k) * math.log1p(-p)) / math.log(2)
+
+def generator_entropy(length, class_sizes):
+    """Exact Shannon entropy in bits of `generate_password` output.
+
+    One character is drawn from each required class, the other
+    m = length - k are uniform over the whole alphabet of size N, and the
+    list is shuffled. A password whose class counts are c_1..c_k then has
+    probability prod(c_i / s_i) * m! / length! / N**m, and each c_i is
+    1 + Binomial(m, s_i / N), so the entropy is
+    sum(log2 s_i - E[log2 c_i]) + m*log2 N + log2(length! / m!).
+    """
+    size = sum(class_sizes)
+    free = length - len(class_sizes)
+    entropy = free * math.log2(size) + (math.lgamma(length + 1) - math.lgamma(free + 1)) / math.log(2)
+    for class_size in class_sizes:
+        p = class_size / size
+        if p == 1:
+            expected_log_count = math.log2(free + 1)
+        else:
+            expected_log_count = sum(2 ** _binomial_log2_pmf(k, free, p) * math.log2(k + 1) for k in range(free + 1))
+        entropy += math.log2(class_size) - expected_log_count
+    return entropy
+
+def _build_keyboard_adjacency():
+    positions = {}
+    for row, keys in enumerate(KEYBOARD_ROWS):
+        for col, key in enumerate(keys):
+            positions[key] = (row, KEYBOARD_ROW_OFFSETS[row] + col)
+    adjacency = set()
+    for key, (row, x) in positions.items():
+        for other, (other_row, other_x) in positions.items():
+            if key != other and abs(row - other_row) <= 1 and abs(x - other_x) <= 1:
+                adjacency.add((key, other))
+    return adjacency, len(positions), len(adjacency) / len(positions)
+
+KEYBOARD_ADJACENCY, KEYBOARD_KEYS, KEYBOARD_DEGREE = _build_keyboard_adjacency()
+
+def _char_class(char):
+    if char.islower():
+        return 'lower'
+    if char.isupper():
+        return 'upper'
+    if char.isdigit():
+        return 'digit'
+    return 'symbol'
+
+CHAR_BITS = {char: math.log2(BRUTEFORCE_CARDINALITY[_char_class(char)]) for char in string.printable}
 
-    # Define character sets
-    characters = string.ascii_lowercase
-    required_chars = [secrets.choice(string.ascii_lowercase)]  # At least one lowercase
+def _char_bits(char):
+    bits = CHAR_BITS.get(char)
+    return bits if bits is not None else math.log2(BRUTEFORCE_CARDINALITY[_char_class(char)])
 
+class PasswordDictionary:
+    """Ranked words for scoring, with a prefix table so substring lookups can stop early."""
+
+    def __init__(self, words):
+        self.ranks = {}
+        for word in words:
+            self.ranks.setdefault(word, len(self.ranks) + 1)
+        self.prefixes = {word[:i] for word in self.ranks for i in range(1, len(word) + 1)}
+
+def load_dictionary(path=None):
+    """Build a `PasswordDictionary` from COMMON_PASSWORDS plus an optional file, most common first."""
+    words = list(COMMON_PASSWORDS)
+    if path:
+        with open(path, encoding='utf-8', errors='ignore') as file:
+            words.extend(word for word in (line.strip().lower() for line in file) if word)
+    return PasswordDictionary(words)
+
+DEFAULT_DICTIONARY = load_dictionary()
+
+def _pattern_matches(password, dictionary):
+    """Yield (start, end, log2 guesses, pattern name) for every recognised substring."""
+    n = len(password)
+    lowered = password.lower()
+    unleeted = lowered.translate(UNLEET_TABLE)
+    for source, leet in ((lowered, False), (unleeted, True)):
+        if leet and unleeted == lowered:
+            break
+        for i in range(n):
+            for j in range(i + 1, n + 1):
+                candidate = source[i:j]
+                if candidate not in dictionary.prefixes:
+                    break
+                rank = dictionary.ranks.get(candidate)
+                if rank and j - i >= 3:
+                    bits = math.log2(rank)
+                    if password[i:j] != lowered[i:j]:
+                        bits += 1 if password[i:j] in (lowered[i:j].capitalize(), lowered[i:j].upper()) else j - i
+                    if leet and candidate != lowered[i:j]:
+                        bits += 1
+                    yield i, j, bits, 'dictionary'
+    i = 0
+    while i < n - 2:
+        j = i + 1
+        while j < n and (lowered[j - 1], lowered[j]) in KEYBOARD_ADJACENCY:
+            j += 1
+        if j - i >= 3:
+            yield i, j, math.log2(KEYBOARD_KEYS) + (j - i - 1) * math.log2(KEYBOARD_DEGREE), 'keyboard walk'
+        j = i + 1
+        while j < n and password[j] == password[i]:
+            j += 1
+        if j - i >= 3:
+            yield i, j, math.log2(BRUTEFORCE_CARDINALITY[_char_class(password[i])] * (j - i)), 'repeat'
+        delta = ord(password[i + 1]) - ord(password[i])
+        if delta in (-1, 1):
+            j = i + 2
+            while j < n and ord(password[j]) - ord(password[j - 1]) == delta:
+                j += 1
+            if j - i >= 3:
+                yield i, j, math.log2(2 * BRUTEFORCE_CARDINALITY[_char_class(password[i])] * (j - i)), 'sequence'
+        i += 1
+    for i in range(n - 3):
+        if password[i:i + 4].isdigit() and 1900 <= int(password[i:i + 4]) <= 2099:
+            yield i, i + 4, math.log2(200), 'year'
+
+def score_password(password, dictionary=DEFAULT_DICTIONARY):
+    """Estimate the guessing entropy of an arbitrary password.
+
+    Pattern matches (dictionary words with case and leetspeak variants,
+    keyboard walks, repeats, sequences, years) and per-character brute force
+    are combined by picking the cheapest segmentation of the password.
+    Returns (bits, strength label, list of patterns used).
+    """
+    n = len(password)
+    ending = [[] for _ in range(n + 1)]
+    for match in _pattern_matches(password, dictionary):
+        ending[match[1]].append(match)
+    best = [0.0] + [math.inf] * n
+    used = [None] * (n + 1)
+    for j in range(1, n + 1):
+        best[j] = best[j - 1] + _char_bits(password[j - 1])
+        for i, _, bits, name in ending[j]:
+            if best[i] + bits < best[j]:
+                best[j] = best[i] + bits
+                used[j] = (i, name)
+    patterns = []
+    j = n
+    while j > 0:
+        if used[j]:
+            i, name = used[j]
+            patterns.append(f"{name}:{password[i:j]}")
+            j = i
+        else:
+            j -= 1
+    label = next((name for limit, name in STRENGTH_LABELS if best[n] < limit), "very strong")
+    return best[n], label, patterns[::-1]
+
+def build_character_sets(use_case_variance, use_numbers, use_special):
+    """Return the full alphabet and the list of classes that must each appear once."""
+    required_sets = [string.ascii_lowercase]
     if use_case_variance:
-        characters += string.ascii_uppercase
-        required_chars.append(secrets.choice(string.ascii_uppercase))  # At least one uppercase
+        required_sets.append(string.ascii_uppercase)
     if use_numbers:
-        characters += string.digits
-        required_chars.append(secrets.choice(string.digits))  # At least one number
+        required_sets.append(string.digits)
     if use_special:
-        characters += string.punctuation
-        required_chars.append(secrets.choice(string.punctuation))  # At least one special
+        required_sets.append(string.punctuation)
+    return ''.join(required_sets), required_sets
+
+class BufferedRandom:
+    """Unbiased small random integers served from large `secrets.token_bytes` blocks."""
+
+    def __init__(self, block_size=RANDOM_BLOCK_SIZE):
+        self._block_size = block_size
+        self._buffer = b''
+        self._pos = 0
+
+    def _take(self, size):
+        if self._pos + size > len(self._buffer):
+            self._buffer = self._buffer[self._pos:] + secrets.token_bytes(self._block_size)
+            self._pos = 0
+        chunk = self._buffer[self._pos:self._pos + size]
+        self._pos += size
+        return chunk
+
+    def randbelow(self, n):
+        """Return a uniform integer in [0, n), rejecting draws that would bias it."""
+        if n <= 256:
+            limit = 256 - 256 % n
+            while True:
+                if self._pos >= len(self._buffer):
+                    self._buffer = secrets.token_bytes(self._block_size)
+                    self._pos = 0
+                byte = self._buffer[self._pos]
+                self._pos += 1
+                if byte < limit:
+                    return byte % n
+        size = (n.bit_length() + 7) // 8
+        span = 1 << (8 * size)
+        limit = span - span % n
+        while True:
+            value = int.from_bytes(self._take(size), 'big')
+            if value < limit:
+                return value % n
 
-    # Check if at least one character set is selected
-    if not characters:
-        print("Error: At least one character set (case variance, numbers, special) must be selected.")
+    def choice(self, seq):
+        return seq[self.randbelow(len(seq))]
+
+    def shuffle(self, items):
+        """Fisher-Yates shuffle in place."""
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+class WordlistIndex:
+    """A wordlist memory-mapped once, with array-backed line offsets for O(1) word lookup.
+
+    Diceware-style lines such as ``11111<TAB>abacus`` are accepted; the last
+    whitespace-separated field of each non-blank line is the word.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._data = b''
+        self._starts = array('Q')
+        self._ends = array('Q')
+        pos, size = 0, len(self._data)
+        while pos < size:
+            end = self._data.find(b'\n', pos)
+            if end == -1:
+                end = size
+            if self._data[pos:end].strip():
+                self._starts.append(pos)
+                self._ends.append(end)
+            pos = end + 1
+        if not self._starts:
+            self.close()
+            raise ValueError(f"Wordlist '{path}' contains no words.")
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, i):
+        return self._data[self._starts[i]:self._ends[i]].split()[-1].decode()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+def generate_passphrases(count, wordlist, num_words, separator='-', rng=None):
+    """Yield `count` passphrases of `num_words` words drawn uniformly from a `WordlistIndex`."""
+    rng = rng or BufferedRandom()
+    size = len(wordlist)
+    for _ in range(count):
+        yield separator.join(wordlist[rng.randbelow(size)] for _ in range(num_words))
+
+def generate_password(length, use_case_variance, use_numbers, use_special):
+    # Enforce minimum length
+    if length < MIN_LENGTH:
+        print(f"Error: Password length must be at least {MIN_LENGTH} characters.")
         return None
 
+    # Define character sets, with at least one character from each selected class
+    characters, required_sets = build_character_sets(use_case_variance, use_numbers, use_special)
+    required_chars = [secrets.choice(charset) for charset in required_sets]
+
     # Check if length is sufficient for required characters
     remaining_length = length - len(required_chars)
     if remaining_length < 0:
@@ -45,20 +312,138 @@ def generate_password(length, use_case_variance, use_numbers, use_special):
     secrets.SystemRandom().shuffle(password)
 
     # Calculate and display entropy
-    entropy = calculate_entropy(length, len(characters))
+    entropy = generator_entropy(length, [len(charset) for charset in required_sets])
     print(f"Password Entropy: {entropy:.2f} bits (Higher is stronger)")
 
     return ''.join(password)
 
+def _password_stream(count, remaining_length, characters, required_sets, rng):
+    for _ in range(count):
+        password = [rng.choice(charset) for charset in required_sets]
+        password += [rng.choice(characters) for _ in range(remaining_length)]
+        rng.shuffle(password)
+        yield ''.join(password)
+
+def generate_passwords(count, length, use_case_variance, use_numbers, use_special, rng=None):
+    """Return an iterator of `count` passwords built like `generate_password`, drawing randomness in bulk."""
+    characters, required_sets = build_character_sets(use_case_variance, use_numbers, use_special)
+    if length < max(MIN_LENGTH, len(required_sets)):
+        raise ValueError(f"Password length must be at least {MIN_LENGTH} characters.")
+    return _password_stream(count, length - len(required_sets), characters, required_sets, rng or BufferedRandom())
+
+def write_passwords(passwords, output, fmt):
+    """Stream passwords to `output` as plain lines, CSV or a JSON array."""
+    if fmt == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(['index', 'password'])
+        for index, password in enumerate(passwords, 1):
+            writer.writerow([index, password])
+    elif fmt == 'json':
+        output.write('[')
+        for index, password in enumerate(passwords):
+            output.write(('\n  ' if index == 0 else ',\n  ') + json.dumps(password))
+        output.write('\n]\n')
+    else:
+        for password in passwords:
+            output.write(password + '\n')
+
+def score_file(path, dictionary=DEFAULT_DICTIONARY):
+    """Yield (password, bits, label, patterns) for each line of `path` ('-' for stdin)."""
+    file = sys.stdin if path == '-' else open(path, encoding='utf-8', errors='replace')
+    try:
+        for line in file:
+            password = line.rstrip('\r\n')
+            if password:
+                yield (password, *score_password(password, dictionary))
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+def write_scores(results, output, fmt):
+    """Stream scoring results to `output` as tab-separated lines, CSV or a JSON array."""
+    if fmt == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(['password', 'bits', 'strength', 'patterns'])
+        for password, bits, label, patterns in results:
+            writer.writerow([password, f"{bits:.2f}", label, ' '.join(patterns)])
+    elif fmt == 'json':
+        output.write('[')
+        for index, (password, bits, label, patterns) in enumerate(results):
+            record = {'password': password, 'bits': round(bits, 2), 'strength': label, 'patterns': patterns}
+            output.write(('\n  ' if index == 0 else ',\n  ') + json.dumps(record))
+        output.write('\n]\n')
+    else:
+        for password, bits, label, patterns in results:
+            output.write(f"{bits:7.2f}\t{label}\t{password}\t{' '.join(patterns)}\n")
+
+def write_output(passwords, path, fmt, writer=write_passwords):
+    """Write bulk results to `path`, or stdout when no path is given."""
+    if path:
+        with open(path, 'w', newline='') as output:
+            writer(passwords, output, fmt)
+    else:
+        writer(passwords, sys.stdout, fmt)
+
 def main():
     parser = argparse.ArgumentParser(description="Generate a cryptographically secure random password.")
-    parser.add_argument("length", type=int, help="Length of the password (minimum 12)")
+    parser.add_argument("length", type=int, nargs="?", help="Length of the password (minimum 12)")
     parser.add_argument("-c", "--case-variance", action="store_true", help="Include both uppercase and lowercase letters")
     parser.add_argument("-n", "--numbers", action="store_true", help="Include numbers")
     parser.add_argument("-s", "--special", action="store_true", help="Include special characters")
+    parser.add_argument("-p", "--passphrase", type=int, metavar="WORDS", help="Generate a passphrase of this many words instead")
+    parser.add_argument("-w", "--wordlist", help="Wordlist for passphrases, one word per line (diceware format accepted)")
+    parser.add_argument("--separator", default="-", help="Separator between passphrase words (default '-')")
+    parser.add_argument("--score", metavar="FILE", help="Score every password in FILE ('-' for stdin) instead of generating")
+    parser.add_argument("--dictionary", help="Extra wordlist for scoring, most common first")
+    parser.add_argument("--count", type=int, help="Generate this many passwords in bulk mode")
+    parser.add_argument("-f", "--format", choices=("plain", "csv", "json"), default="plain", help="Bulk and --score output format (default plain)")
+    parser.add_argument("-o", "--output", help="Bulk output file (default stdout)")
 
     args = parser.parse_args()
 
+    if args.score:
+        try:
+            dictionary = load_dictionary(args.dictionary)
+            write_output(score_file(args.score, dictionary), args.output, args.format, write_scores)
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    if args.passphrase is not None:
+        if not args.wordlist:
+            parser.error("--passphrase requires --wordlist")
+        try:
+            wordlist = WordlistIndex(args.wordlist)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        entropy = calculate_entropy(args.passphrase, len(wordlist))
+        passphrases = generate_passphrases(1 if args.count is None else args.count, wordlist, args.passphrase, args.separator)
+        if args.count is None:
+            print(f"Passphrase Entropy: {entropy:.2f} bits (Higher is stronger)")
+            print("Generated Passphrase:", next(passphrases))
+        else:
+            write_output(passphrases, args.output, args.format)
+            print(f"Passphrase Entropy: {entropy:.2f} bits each (Higher is stronger)", file=sys.stderr)
+        wordlist.close()
+        return
+
+    if args.length is None:
+        parser.error("the following arguments are required: length")
+
+    if args.count is not None:
+        try:
+            passwords = generate_passwords(args.count, args.length, args.case_variance, args.numbers, args.special)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        write_output(passwords, args.output, args.format)
+        _, required_sets = build_character_sets(args.case_variance, args.numbers, args.special)
+        entropy = generator_entropy(args.length, [len(charset) for charset in required_sets])
+        print(f"Password Entropy: {entropy:.2f} bits each (Higher is stronger)", file=sys.stderr)
+        return
+
     password = generate_password(args.length, args.case_variance, args.numbers, args.special)
 
     if password:
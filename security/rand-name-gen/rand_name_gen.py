@@ -1,34 +1,227 @@
 import os
+import sys
+import json
 import uuid
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
-def rename_files(directory, extensions):
-    # Change directory
-    os.chdir(directory)
-    
-    # Get list of files with specified extensions
-    files = [f for f in os.listdir() if os.path.isfile(f) and f.lower().endswith(extensions)]
-    
-    # Rename files with random names
-    for filename in files:
-        if filename != 'rand_name_gen.py':
-            ext = os.path.splitext(filename)[1]
-            new_name = str(uuid.uuid4())[:8] + ext
-            try:
-                os.rename(filename, new_name)
-                print(f"Renamed '{filename}' to '{new_name}'")
-            except OSError as e:
-                print(f"Error renaming '{filename}': {e}")
+SCRIPT_NAME = os.path.basename(__file__)
+JOURNAL_NAME = "rand_name_journal.jsonl"
+BATCH_SIZE = 1000
 
-if __name__ == "__main__":
-    # Get current working directory
-    directory = os.getcwd()
+def random_name(ext, used_names):
+    # Draw 8-character UUID prefixes until one is not already taken in this directory
+    while True:
+        new_name = uuid.uuid4().hex[:8] + ext
+        if new_name not in used_names:
+            used_names.add(new_name)
+            return new_name
+
+def scan_directories(directory, recursive=False):
+    # Yield (directory, entries) one directory at a time using os.scandir
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"Error scanning '{current}': {e}")
+            continue
+        if recursive:
+            pending.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+        yield current, entries
+
+def plan_renames(directory, extensions, recursive=False, skip_paths=()):
+    # Yield (old_path, new_path) pairs; names are unique among everything already in each directory
+    skip_paths = {os.path.abspath(path) for path in skip_paths}
+    for current, entries in scan_directories(directory, recursive):
+        used_names = {entry.name for entry in entries}
+        for entry in entries:
+            if entry.name == SCRIPT_NAME or not entry.is_file(follow_symlinks=False):
+                continue
+            if os.path.abspath(entry.path) in skip_paths:
+                continue
+            if not entry.name.lower().endswith(extensions):
+                continue
+            ext = os.path.splitext(entry.name)[1]
+            yield entry.path, os.path.join(current, random_name(ext, used_names))
+
+def _rename(pair):
+    old_path, new_path = pair
+    try:
+        os.rename(old_path, new_path)
+        return old_path, new_path, None
+    except OSError as e:
+        return old_path, new_path, e
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class RenameJournal:
+    """Append-only JSONL log of old -> new paths, flushed to disk once per batch.
+
+    Each batch is written and fsynced before its renames start, so after an
+    interruption the journal covers every rename that may have happened.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        _drop_torn_tail(path)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, pairs):
+        # Absolute paths, so the journal can be undone or replayed from any working directory
+        self._file.write(''.join(json.dumps({'old': os.path.abspath(old), 'new': os.path.abspath(new)}) + '\n'
+                                 for old, new in pairs))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+def _drop_torn_tail(path):
+    # A crash part-way through record() leaves a last line without its newline; its renames never started,
+    # so it is cut off to keep the next run's records on lines of their own
+    try:
+        file = open(path, 'r+b')
+    except FileNotFoundError:
+        return
+    with file:
+        end = file.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - 65536)
+            file.seek(start)
+            newline = file.read(end - start).rfind(b'\n')
+            if newline >= 0:  # a journal ending in a newline is left as it is
+                file.truncate(start + newline + 1)
+                return
+            end = start
+        file.truncate(0)
+
+def _after_torn_write(line):
+    # Journals written before torn tails were cut off can have a record appended to a torn one;
+    # the torn prefix is dropped and the record after it kept
+    start = line.rfind('{"old": ', 1)
+    if start < 0:
+        return None
+    try:
+        return json.loads(line[start:])
+    except ValueError:
+        return None
+
+def read_journal(path):
+    # A torn last line, or a torn write followed by more records, is skipped, as its renames never started
+    with open(path, encoding='utf-8') as file:
+        lines = [line for line in file if line.strip()]
+    entries = []
+    for number, line in enumerate(lines, 1):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            entry = _after_torn_write(line)
+            if entry is None:
+                if number == len(lines):
+                    break
+                raise
+        entries.append((entry['old'], entry['new']))
+    return entries
+
+def rename_files(directory, extensions, recursive=False, threads=1, journal=None, verbose=True):
+    # Rename files with random names, streaming the plan in batches through an optional thread pool
+    renamed = 0
+    pool = ThreadPoolExecutor(threads) if threads > 1 else None
+    skip_paths = [journal.path] if journal else []
+    try:
+        for batch in _batches(plan_renames(directory, extensions, recursive, skip_paths), BATCH_SIZE):
+            if journal:
+                journal.record(batch)
+            renamed += _apply(batch, pool, verbose)
+    finally:
+        if pool:
+            pool.shutdown()
+    return renamed
+
+def _apply(pairs, pool, verbose):
+    renamed = 0
+    results = pool.map(_rename, pairs) if pool else map(_rename, pairs)
+    for old_path, new_path, error in results:
+        if error:
+            print(f"Error renaming '{old_path}': {error}")
+        else:
+            renamed += 1
+            if verbose:
+                print(f"Renamed '{old_path}' to '{os.path.basename(new_path)}'")
+    return renamed
+
+def replay_journal(path, undo=False, verbose=True):
+    # Undo (newest first) or redo the renames in a journal, skipping entries that were never applied
+    # Entries are checked one at a time, just before renaming, so chains across runs (a -> b, b -> c) resolve
+    entries = read_journal(path)
+    if undo:
+        entries = [(new, old) for old, new in reversed(entries)]
+    renamed = skipped = 0
+    for src, dst in entries:
+        if not os.path.lexists(src) or os.path.lexists(dst):
+            skipped += 1
+            continue
+        renamed += _apply([(src, dst)], None, verbose)
+    return renamed, skipped
+
+def parse_extensions(extensions_input):
+    extensions = [ext.strip().lower().lstrip('.') for ext in extensions_input.split(',')]
+    return tuple('.' + ext for ext in extensions if ext)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rename files with random names based on their extensions.")
+    parser.add_argument("directory", nargs="?", default=os.getcwd(), help="Directory to process (default: current directory)")
+    parser.add_argument("-e", "--extensions", help="Comma-separated extensions, e.g. png,jpg (prompted for if omitted)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Also rename files in subdirectories")
+    parser.add_argument("-t", "--threads", type=int, default=1, help="Rename with this many worker threads (default 1)")
+    parser.add_argument("-j", "--journal", help=f"Journal file to append renames to (default: {JOURNAL_NAME} in the directory)")
+    parser.add_argument("--no-journal", action="store_true", help="Do not keep a journal")
+    parser.add_argument("--undo", metavar="JOURNAL", help="Reverse every rename recorded in JOURNAL and exit")
+    parser.add_argument("--replay", metavar="JOURNAL", help="Re-apply the renames recorded in JOURNAL and exit")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print each rename")
+    args = parser.parse_args()
+
+    if args.undo or args.replay:
+        try:
+            renamed, skipped = replay_journal(args.undo or args.replay, bool(args.undo), not args.quiet)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading journal: {e}")
+            sys.exit(1)
+        print(f"{'Restored' if args.undo else 'Replayed'} {renamed} file(s), skipped {skipped} not applicable.")
+        return
 
     # Ask user for file extensions
-    extensions_input = input("Enter file extensions to rename (comma-separated, e.g., png,jpg): ")
-    extensions = [ext.strip().lower() for ext in extensions_input.split(',')]
+    extensions_input = args.extensions
+    if extensions_input is None:
+        extensions_input = input("Enter file extensions to rename (comma-separated, e.g., png,jpg): ")
+    extensions = parse_extensions(extensions_input)
 
     if not extensions:
         print("No extensions provided. Exiting.")
     else:
-        # Rename files
-        rename_files(directory, tuple(extensions))
+        # Rename files, journaling each batch before it is applied
+        journal = None
+        if not args.no_journal:
+            journal = RenameJournal(args.journal or os.path.join(args.directory, JOURNAL_NAME))
+        try:
+            renamed = rename_files(args.directory, extensions, args.recursive, args.threads, journal, not args.quiet)
+        finally:
+            if journal:
+                journal.close()
+        print(f"Renamed {renamed} file(s).")
+        if journal:
+            print(f"Undo with: python {SCRIPT_NAME} --undo {journal.path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,365 @@
-from itertools import permutations
+import argparse
+import gzip
+import lzma
+import mmap
+import os
+import shutil
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, permutations, product
+from math import factorial, prod
 
-def generate_combinations(input_string):
-	#Generate all permutations of the input string
-	perms = permutations(input_string)
-	combinations = [''.join(perm) for perm in perms]
-	return combinations
+CHUNK_SIZE = 100000
+OUTPUT_FORMATS = {'.gz': 'gzip', '.xz': 'xz', '.zst': 'zstd', '.bin': 'binary'}
+LEET_TABLE = {'a': '4@', 'e': '3', 'i': '1!', 'o': '0', 's': '5$', 't': '7', 'l': '1', 'g': '9', 'b': '8'}
 
-def write_to_dat(combinations, output_file):
-	with open(output_file, 'w') as file:
-		for combination in combinations :
-			file.write(combination + '\n')
+def count_unique(input_string):
+	#Multinomial coefficient n! / (c1! * c2! * ...) over the character counts
+	return factorial(len(input_string)) // prod(factorial(c) for c in Counter(input_string).values())
+
+def rank_permutation(word):
+	#Index of word among the distinct permutations of its characters, in lexicographic order
+	counts = Counter(word)
+	remaining = len(word)
+	total = count_unique(word)
+	rank = 0
+	for char in word:
+		for smaller in sorted(counts):
+			if smaller >= char:
+				break
+			rank += total * counts[smaller] // remaining
+		total = total * counts[char] // remaining
+		counts[char] -= 1
+		remaining -= 1
+	return rank
+
+def unrank_permutation(input_string, index):
+	#Distinct permutation at position index (the factorial number system, generalised to repeated characters)
+	counts = Counter(input_string)
+	remaining = len(input_string)
+	total = count_unique(input_string)
+	if not 0 <= index < total:
+		raise ValueError(f"index must be in [0, {total}), got {index}")
+	chars = []
+	for _ in range(len(input_string)):
+		for char in sorted(counts):
+			if not counts[char]:
+				continue
+			block = total * counts[char] // remaining
+			if index < block:
+				chars.append(char)
+				total = block
+				counts[char] -= 1
+				remaining -= 1
+				break
+			index -= block
+	return ''.join(chars)
+
+def unique_permutations(input_string, start=0, stop=None):
+	#Yield distinct permutations start..stop-1 once each, in lexicographic order (next-permutation over sorted characters)
+	total = count_unique(input_string)
+	stop = total if stop is None else min(stop, total)
+	if start >= stop:
+		return
+	chars = list(unrank_permutation(input_string, start)) if start else sorted(input_string)
+	n = len(chars)
+	for _ in range(stop - start - 1):
+		yield ''.join(chars)
+		i = n - 2
+		while chars[i] >= chars[i + 1]:
+			i -= 1
+		j = n - 1
+		while chars[j] <= chars[i]:
+			j -= 1
+		chars[i], chars[j] = chars[j], chars[i]
+		chars[i + 1:] = reversed(chars[i + 1:])
+	yield ''.join(chars)
+
+def generate_combinations(input_string, unique=True):
+	#Lazily yield every permutation of the input string, skipping repeats unless unique is False
+	if unique:
+		yield from unique_permutations(input_string)
+		return
+	for perm in permutations(input_string):
+		yield ''.join(perm)
+
+def estimate_output(input_string, unique=True):
+	#Return (number of lines, output size in bytes) for a full run
+	count = count_unique(input_string) if unique else factorial(len(input_string))
+	return count, count * (len(input_string.encode()) + 1)
+
+def combine_words(words, max_words=2):
+	#Yield every ordered concatenation of 1..max_words distinct base words
+	for r in range(1, max_words + 1):
+		for combo in permutations(words, r):
+			yield ''.join(combo)
+
+def _unique_variants(variants):
+	seen = set()
+	for variant in variants:
+		if variant not in seen:
+			seen.add(variant)
+			yield variant
+
+def case_variants(candidates, mode='common'):
+	#'common' yields lower/Capitalized/UPPER forms, 'all' every upper/lower combination
+	for word in candidates:
+		if mode == 'all':
+			options = [(c.lower(), c.upper()) if c.lower() != c.upper() else (c,) for c in word]
+			yield from _unique_variants(map(''.join, product(*options)))
+		elif mode == 'common':
+			yield from _unique_variants((word.lower(), word.capitalize(), word.upper()))
+		else:
+			yield word
+
+def leet_variants(candidates, table=LEET_TABLE):
+	#Yield each candidate with every combination of leetspeak substitutions
+	for word in candidates:
+		options = [(c,) + tuple(table.get(c.lower(), '')) for c in word]
+		yield from map(''.join, product(*options))
+
+def add_suffixes(candidates, suffixes):
+	#Yield each candidate followed by every suffix; include '' in suffixes to keep the bare word
+	#suffixes is a sequence, or a callable returning a fresh iterator per word so huge suffix streams are never held in memory
+	for word in candidates:
+		for suffix in (suffixes() if callable(suffixes) else suffixes):
+			yield word + suffix
+
+def digit_suffixes(max_digits):
+	#'' followed by every digit string of length 1..max_digits
+	yield ''
+	for length in range(1, max_digits + 1):
+		for number in range(10 ** length):
+			yield f"{number:0{length}d}"
+
+def year_suffixes(start, end):
+	for year in range(start, end + 1):
+		yield str(year)
+
+def length_filter(candidates, min_length=0, max_length=None):
+	for word in candidates:
+		if len(word) >= min_length and (max_length is None or len(word) <= max_length):
+			yield word
+
+def mutate(words, max_words=2, case='common', leet=False, suffixes=('',), min_length=0, max_length=None):
+	#Compose the mutation rules into one lazy candidate pipeline
+	candidates = combine_words(words, max_words)
+	if leet:
+		candidates = leet_variants(candidates)
+	candidates = case_variants(candidates, case)
+	candidates = add_suffixes(candidates, suffixes)
+	return length_filter(candidates, min_length, max_length)
+
+def format_size(num_bytes):
+	for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+		if num_bytes < 1024:
+			return f"{num_bytes:.1f} {unit}"
+		num_bytes /= 1024
+	return f"{num_bytes:.1f} PB"
+
+def print_progress(written, total, start_time):
+	elapsed = time.monotonic() - start_time
+	rate = written / elapsed if elapsed > 0 else 0
+	if total:
+		eta = (total - written) / rate if rate else 0
+		sys.stderr.write(f"\r{written:,}/{total:,} ({written / total:.1%}) {rate:,.0f}/s ETA {eta:,.0f}s ")
+	else:
+		sys.stderr.write(f"\r{written:,} written {rate:,.0f}/s ")
+	sys.stderr.flush()
+
+def detect_format(output_file):
+	#Pick the output format from the file extension, defaulting to plain text
+	return OUTPUT_FORMATS.get(os.path.splitext(output_file)[1].lower(), 'text')
+
+def open_sink(output_file, fmt='text', append=False):
+	#Open a binary stream for the given output format
+	mode = 'ab' if append else 'wb'
+	if fmt == 'gzip':
+		return gzip.open(output_file, mode, compresslevel=6)
+	if fmt == 'xz':
+		return lzma.open(output_file, mode, preset=6)
+	if fmt == 'zstd':
+		try:
+			import zstandard
+		except ImportError:
+			sys.exit("zstd output needs the 'zstandard' library: pip install zstandard")
+		return zstandard.ZstdCompressor(level=3).stream_writer(open(output_file, mode), closefd=True)
+	return open(output_file, mode, buffering=1 << 20)
+
+def write_to_dat(combinations, output_file, total=None, chunk_size=CHUNK_SIZE, progress=True, append=False, fmt='text'):
+	#Write combinations in large chunks as they are produced, keeping memory constant
+	#The 'binary' format stores equal-length records back to back with no separator
+	combinations = iter(combinations)
+	separator = '' if fmt == 'binary' else '\n'
+	written = 0
+	start_time = time.monotonic()
+	with open_sink(output_file, fmt, append) as file:
+		while True:
+			chunk = list(islice(combinations, chunk_size))
+			if not chunk:
+				break
+			chunk.append('')
+			file.write(separator.join(chunk).encode())
+			written += len(chunk) - 1
+			if progress:
+				print_progress(written, total, start_time)
+	if progress:
+		sys.stderr.write('\n')
+	return written
+
+def open_binary_wordlist(path):
+	#Memory-map a 'binary' format wordlist for random access with read_record
+	with open(path, 'rb') as file:
+		return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def read_record(wordlist, index, width):
+	#Return record index of a memory-mapped binary wordlist whose records are width bytes long
+	return wordlist[index * width:(index + 1) * width].decode()
+
+def completed_lines(output_file, width=None):
+	#Count the complete records of an interrupted run, truncating any partial last one
+	#Text files are split on newlines; binary files (width given) hold fixed-width records
+	if not os.path.exists(output_file):
+		return 0
+	if width:
+		lines = os.path.getsize(output_file) // width
+		os.truncate(output_file, lines * width)
+		return lines
+	lines = 0
+	last_newline = 0
+	offset = 0
+	with open(output_file, 'rb+') as file:
+		while True:
+			block = file.read(1 << 20)
+			if not block:
+				break
+			count = block.count(b'\n')
+			if count:
+				lines += count
+				last_newline = offset + block.rindex(b'\n') + 1
+			offset += len(block)
+		file.truncate(last_newline)
+	return lines
+
+def shard_prefixes(input_string, min_shards):
+	#Split the distinct permutations into (prefix, remaining characters) shards, in lexicographic order
+	shards = [('', sorted(input_string))]
+	while len(shards) < min_shards and shards[0][1]:
+		next_shards = []
+		for prefix, rest in shards:
+			for char in sorted(set(rest)):
+				remaining = list(rest)
+				remaining.remove(char)
+				next_shards.append((prefix + char, remaining))
+		shards = next_shards
+	return [(prefix, ''.join(rest)) for prefix, rest in shards]
+
+def _write_shard(job):
+	prefix, rest, path, fmt = job
+	return write_to_dat((prefix + perm for perm in unique_permutations(rest)), path, progress=False, fmt=fmt)
+
+def write_sharded(input_string, output_file, jobs, keep_shards=False, fmt='text'):
+	#Generate prefix shards in a process pool, then concatenate them in order into output_file
+	#Concatenated gzip, xz and zstd streams are themselves valid streams, so every format merges by copying
+	shards = shard_prefixes(input_string, jobs * 4)
+	paths = [f"{output_file}.part{i:04d}" for i in range(len(shards))]
+	total = count_unique(input_string)
+	written = 0
+	start_time = time.monotonic()
+	with ProcessPoolExecutor(jobs) as pool:
+		for count in pool.map(_write_shard, [(prefix, rest, path, fmt) for (prefix, rest), path in zip(shards, paths)]):
+			written += count
+			print_progress(written, total, start_time)
+	sys.stderr.write('\n')
+	if keep_shards:
+		return paths
+	with open(output_file, 'wb') as out:
+		for path in paths:
+			with open(path, 'rb') as shard:
+				shutil.copyfileobj(shard, out, 1 << 20)
+			os.remove(path)
+	return [output_file]
+
+def parse_year_range(value):
+	start, _, end = value.partition('-')
+	return int(start), int(end or start)
 
 def main():
-	input_string = input("Enter the input string:")
-	output_file = input("Enter the output file name with .dat extension:")
-	combinations = generate_combinations(input_string)
-	write_to_dat(combinations, output_file)
-	print("Combinations have been written to", output_file)
+	parser = argparse.ArgumentParser(description="Generate every distinct permutation of a string, or rule-based mutations of base words, as a wordlist.")
+	parser.add_argument("input_string", nargs="?", help="String to permute, or comma-separated base words with --mutate (prompted for if omitted)")
+	parser.add_argument("output_file", nargs="?", help="Output .dat file (prompted for if omitted)")
+	parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes; above 1 shards the output by prefix")
+	parser.add_argument("--keep-shards", action="store_true", help="Leave per-shard .partNNNN files instead of merging them")
+	parser.add_argument("-f", "--format", choices=("text", "gzip", "xz", "zstd", "binary"), help="Output format (default: from the extension, .gz/.xz/.zst/.bin, else text)")
+	parser.add_argument("-y", "--yes", action="store_true", help="Do not ask for confirmation")
+	parser.add_argument("--start", type=int, default=0, help="Index of the first permutation to write (default 0)")
+	parser.add_argument("--stop", type=int, help="Index to stop before (default: all permutations)")
+	parser.add_argument("--resume", action="store_true", help="Continue an interrupted run, appending after the lines already in output_file")
+	mutation = parser.add_argument_group("mutation mode")
+	mutation.add_argument("-m", "--mutate", action="store_true", help="Mutate base words instead of permuting characters")
+	mutation.add_argument("--max-words", type=int, default=2, help="Concatenate up to this many base words (default 2)")
+	mutation.add_argument("--case", choices=("none", "common", "all"), default="common", help="Case toggling rule (default common)")
+	mutation.add_argument("--leet", action="store_true", help="Apply leetspeak substitutions")
+	mutation.add_argument("--digits", type=int, default=0, help="Append every number of up to this many digits")
+	mutation.add_argument("--years", type=parse_year_range, help="Append years, e.g. 1990-2025")
+	mutation.add_argument("--min-length", type=int, default=0, help="Drop candidates shorter than this")
+	mutation.add_argument("--max-length", type=int, help="Drop candidates longer than this")
+	args = parser.parse_args()
+
+	input_string = args.input_string if args.input_string is not None else input("Enter the input string:")
+	output_file = args.output_file or input("Enter the output file name with .dat extension:")
+	fmt = args.format or detect_format(output_file)
+
+	if args.mutate:
+		if fmt == 'binary':
+			parser.error("the binary format needs equal-length records and is not available with --mutate")
+		words = [word.strip() for word in input_string.split(',') if word.strip()]
+		def suffixes():
+			if args.years:
+				return chain(digit_suffixes(args.digits), year_suffixes(*args.years))
+			return digit_suffixes(args.digits)
+		candidates = mutate(words, args.max_words, args.case, args.leet, suffixes, args.min_length, args.max_length)
+		written = write_to_dat(candidates, output_file, fmt=fmt)
+		print(f"{written:,} candidates have been written to", output_file)
+		return
+
+	if args.jobs > 1 and (args.start or args.stop is not None or args.resume):
+		parser.error("--start, --stop and --resume cannot be combined with --jobs")
+	if args.resume and fmt not in ('text', 'binary'):
+		parser.error("--resume is only supported for text and binary output")
+	if args.start < 0:
+		parser.error("--start must be at least 0")
+	if args.stop is not None and args.stop < args.start:
+		parser.error("--stop must not be less than --start")
+	width = len(input_string.encode())
+	total = count_unique(input_string)
+	if args.start >= total:
+		parser.error(f"--start must be less than the number of combinations ({total:,})")
+	start = args.start
+	stop = total if args.stop is None else min(args.stop, total)
+	done = completed_lines(output_file, width if fmt == 'binary' else None) if args.resume else 0
+	count = max(stop - start - done, 0)
+	size = count * (width if fmt == 'binary' else width + 1)
+	if done:
+		print(f"Resuming after {done:,} lines already in {output_file}.")
+	print(f"This will write {count:,} combinations ({format_size(size)}{' before compression' if fmt in ('gzip', 'xz', 'zstd') else ''}).")
+	if fmt == 'binary':
+		print(f"Binary records are {width} bytes each with no separator.")
+	duplicates = factorial(len(input_string)) - total
+	if duplicates:
+		print(f"Skipping {duplicates:,} duplicate arrangements of repeated characters.")
+	if not args.yes and input("Continue? [y/N]: ").strip().lower() not in ('y', 'yes'):
+		print("Aborted.")
+		return
+	if args.jobs > 1:
+		outputs = write_sharded(input_string, output_file, args.jobs, args.keep_shards, fmt)
+		print(f"Combinations have been written to {len(outputs)} file(s):", ', '.join(outputs) if len(outputs) < 5 else f"{outputs[0]} ... {outputs[-1]}")
+	else:
+		combinations = unique_permutations(input_string, start + done, stop)
+		write_to_dat(combinations, output_file, total=count, append=args.resume, fmt=fmt)
+		print("Combinations have been written to", output_file)
 
 if __name__ == "__main__":
 	main()